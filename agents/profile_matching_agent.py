@@ -4,20 +4,85 @@ Profile Matching Agent for finding and merging customer profiles across multiple
 
 import os
 import json
+import gzip
+import hashlib
 import logging
+import threading
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Union, Tuple
 from pathlib import Path
 from rapidfuzz import fuzz, process
 from datetime import datetime
 import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dateutil import parser
-from difflib import SequenceMatcher
 import phonenumbers
 from email_validator import validate_email, EmailNotValidError
 
+# Optional Parquet support for caching processed CSVs
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional fast JSON library for schema files and saved profiles
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional zstd compression for saved profiles (gzip is used otherwise)
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Optional Aho-Corasick automaton for scanning names against the nickname table
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # No need to import unified schema - will load from file
 
+NORMALIZE_CACHE_SIZE = 100000  # Number of normalized values cached per normalizer
+MAX_WORKERS = min(4, os.cpu_count() or 1)  # Sources matched in parallel; cdist already uses every core per column
+PROFILE_WRITE_BUFFER_SIZE = 1024 * 1024  # Large enough to flush a merged profile in one write
+PROFILES_JSONL_FILE = "profiles.jsonl"  # Append-only profile log for bulk screening runs
+PROFILE_COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+PROFILE_COMPRESSION_LEVEL = 3
+FILENAME_TRANSLATION = str.maketrans(' ', '_')  # Spaces in query values -> profile filenames
+VOLATILE_PROFILE_FIELDS = {'merged_at'}  # Ignored when checking whether a profile changed
+PARQUET_CACHE_DIR = "_cache"  # Subdirectory of the processed data holding Parquet copies of the CSVs
+PARQUET_CACHE_VERSION = 2  # Bump when the cached frames change, so older copies are rebuilt
+
+# Precompiled normalizer patterns
+NAME_STRIP_RE = re.compile(r'[^a-z0-9\s\-]')  # Anything but letters, digits, spaces and hyphens
+NON_DIGIT_RE = re.compile(r'\D')
+ID_STRIP_RE = re.compile(r'[^a-zA-Z0-9]')
+
+PHONE_MAX_DIGITS = 17  # Longest national number phonenumbers accepts
+
+# Soundex digit of each consonant, used for phonetic name blocking keys
+SOUNDEX_CODES = {letter: str(code) for code, letters in enumerate(
+    ['bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r'], start=1) for letter in letters}
+
+# Date formats tried when detecting the format of a date column, in order of preference
+DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d', '%d-%m-%Y', '%m-%d-%Y', '%Y%m%d']
+DATE_FORMAT_SAMPLE_SIZE = 20  # Number of values sampled to detect a column's date format
+
+# Date scoring: day-difference bucket edges and the score of each bucket
+MISSING_DAYS = np.iinfo(np.int64).min  # Day number of a missing or invalid date (NaT)
+DATE_DIFF_DAYS = np.array([0, 1, 7, 30, 365])
+DATE_DIFF_SCORES = np.array([100.0, 90.0, 80.0, 60.0, 40.0, 0.0])
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,9 +93,69 @@ class ProfileMatchingAgent:
     Uses both exact and fuzzy matching to find related records.
     """
     
+    # Comprehensive name variations and nicknames database, shared by all instances
+    NAME_PATTERNS = {
+        'suffixes': ('jr', 'sr', 'ii', 'iii', 'iv', 'v'),
+        'prefixes': ('mr', 'mrs', 'ms', 'miss', 'dr', 'prof'),
+        'separators': (' ', '-', '.', "'"),
+        'nicknames': {
+            # Full name -> nicknames
+            'leonardo': ('leo', 'leon'),
+            'leonardo dicaprio': ('leo dicaprio', 'leo d', 'leonardo d'),
+            'alexander': ('alex', 'al', 'sandy'),
+            'christopher': ('chris', 'kit'),
+            'elizabeth': ('liz', 'beth', 'betty', 'eliza'),
+            'william': ('will', 'bill', 'billy'),
+            'robert': ('rob', 'bob', 'bobby'),
+            'richard': ('rick', 'dick', 'rich'),
+            'michael': ('mike', 'mick', 'mickey'),
+            'daniel': ('dan', 'danny'),
+            'anthony': ('tony', 'ant'),
+            'matthew': ('matt', 'matty'),
+            'andrew': ('andy', 'drew'),
+            'joseph': ('joe', 'joey'),
+            'jonathan': ('jon', 'johnny'),
+            'benjamin': ('ben', 'benny'),
+            'nicholas': ('nick', 'nicky'),
+            'samuel': ('sam', 'sammy'),
+            'david': ('dave', 'davy'),
+            'thomas': ('tom', 'tommy'),
+            'james': ('jim', 'jimmy', 'jamie'),
+            'john': ('johnny', 'jack'),
+            'patricia': ('pat', 'patty', 'trish'),
+            'jennifer': ('jen', 'jenny'),
+            'linda': ('lin', 'lindy'),
+            'barbara': ('barb', 'barbie'),
+            'susan': ('sue', 'susie'),
+            'jessica': ('jess', 'jessie'),
+            'sarah': ('sara', 'sally'),
+            'karen': ('kare', 'kay'),
+            'nancy': ('nan', 'ann'),
+            'lisa': ('lise', 'liz'),
+            'betty': ('beth', 'bette'),
+            'helen': ('nell', 'lena'),
+            'sandra': ('sandy', 'sandi'),
+            'donna': ('don', 'dona'),
+            'carol': ('carrie', 'carolina'),
+            'ruth': ('ruthie',),
+            'sharon': ('shari',),
+            'michelle': ('mich', 'mickey'),
+            'laura': ('laurie',),
+            'kimberly': ('kim',),
+            'deborah': ('deb', 'debbie'),
+            'dorothy': ('dot', 'dotty'),
+            'maria': ('mary',),
+            'katherine': ('kate', 'katie', 'kathy', 'kay'),
+            'margaret': ('maggie', 'meg', 'peggy')
+        }
+    }
+    
     def __init__(self, processed_data_dir: str = "output", 
                  profiles_dir: str = "profiles_found",
-                 schema_mappings_dir: str = "schema_mappings"):
+                 schema_mappings_dir: str = "schema_mappings",
+                 max_workers: int = MAX_WORKERS,
+                 pretty_profiles: bool = False,
+                 profile_compression: Optional[str] = None):
         """
         Initialize the Profile Matching Agent.
         
@@ -38,11 +163,33 @@ class ProfileMatchingAgent:
             processed_data_dir (str): Directory containing processed data files from Agent 1
             profiles_dir (str): Directory to save found profiles
             schema_mappings_dir (str): Directory containing schema mapping files
+            max_workers (int): Maximum number of sources matched in parallel
+            pretty_profiles (bool): Indent saved profile JSON for reading (compact otherwise)
+            profile_compression (Optional[str]): Compress saved profiles with 'zstd' or 'gzip'
+                (written as .json.zst / .json.gz), or None for plain .json files
         """
         self.processed_data_dir = processed_data_dir
         self.profiles_dir = profiles_dir
         self.schema_mappings_dir = schema_mappings_dir
+        self.max_workers = max_workers
+        self.pretty_profiles = pretty_profiles
+        
+        if profile_compression not in PROFILE_COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported profile compression: {profile_compression}")
+        if profile_compression == 'zstd' and not ZSTD_AVAILABLE:
+            logger.warning("zstandard is not installed, compressing profiles with gzip instead")
+            profile_compression = 'gzip'
+        self.profile_compression = profile_compression
+        
+        # Saved profile location, resolved once for all saves
+        self._profiles_dir_path = Path(self.profiles_dir)
+        self._profile_suffix = '.json' + PROFILE_COMPRESSION_SUFFIXES[profile_compression]
+        
+        # Serializes profile writes from concurrent searches
+        self._write_lock = threading.Lock()
+        self._profile_hashes = {}  # file path -> hash of the profile last written there
         self.schema_mappings = {}
+        self._reverse_mappings = {}  # source -> unified field -> source fields
         self.unified_schema = self._load_unified_schema()
         
         # Matching configuration with adjusted weights
@@ -77,76 +224,99 @@ class ProfileMatchingAgent:
             'preferred_combination': ['full_name', 'dob']    # Preferred combination for matching
         }
         
-        # Comprehensive name variations and nicknames database
-        self.NAME_PATTERNS = {
-            'suffixes': ['jr', 'sr', 'ii', 'iii', 'iv', 'v'],
-            'prefixes': ['mr', 'mrs', 'ms', 'miss', 'dr', 'prof'],
-            'separators': [' ', '-', '.', "'"],
-            'nicknames': {
-                # Full name -> nicknames
-                'leonardo': ['leo', 'leon'],
-                'leonardo dicaprio': ['leo dicaprio', 'leo d', 'leonardo d'],
-                'alexander': ['alex', 'al', 'sandy'],
-                'christopher': ['chris', 'kit'],
-                'elizabeth': ['liz', 'beth', 'betty', 'eliza'],
-                'william': ['will', 'bill', 'billy'],
-                'robert': ['rob', 'bob', 'bobby'],
-                'richard': ['rick', 'dick', 'rich'],
-                'michael': ['mike', 'mick', 'mickey'],
-                'daniel': ['dan', 'danny'],
-                'anthony': ['tony', 'ant'],
-                'matthew': ['matt', 'matty'],
-                'andrew': ['andy', 'drew'],
-                'joseph': ['joe', 'joey'],
-                'jonathan': ['jon', 'johnny'],
-                'benjamin': ['ben', 'benny'],
-                'nicholas': ['nick', 'nicky'],
-                'samuel': ['sam', 'sammy'],
-                'david': ['dave', 'davy'],
-                'thomas': ['tom', 'tommy'],
-                'james': ['jim', 'jimmy', 'jamie'],
-                'john': ['johnny', 'jack'],
-                'patricia': ['pat', 'patty', 'trish'],
-                'jennifer': ['jen', 'jenny'],
-                'linda': ['lin', 'lindy'],
-                'barbara': ['barb', 'barbie'],
-                'susan': ['sue', 'susie'],
-                'jessica': ['jess', 'jessie'],
-                'sarah': ['sara'],
-                'karen': ['kare'],
-                'nancy': ['nan'],
-                'lisa': ['lise'],
-                'betty': ['beth'],
-                'helen': ['nell'],
-                'sandra': ['sandy'],
-                'donna': ['don'],
-                'carol': ['carrie'],
-                'ruth': ['ruthie'],
-                'sharon': ['shari'],
-                'michelle': ['mich', 'mickey'],
-                'laura': ['laurie'],
-                'sarah': ['sally'],
-                'kimberly': ['kim'],
-                'deborah': ['deb', 'debbie'],
-                'dorothy': ['dot', 'dotty'],
-                'lisa': ['liz'],
-                'nancy': ['ann'],
-                'karen': ['kay'],
-                'betty': ['bette'],
-                'helen': ['lena'],
-                'sandra': ['sandi'],
-                'donna': ['dona'],
-                'carol': ['carolina'],
-                'maria': ['mary'],
-                'katherine': ['kate', 'katie', 'kathy', 'kay'],
-                'margaret': ['maggie', 'meg', 'peggy']
-            }
+        # Strong match rules (see _is_strong_match): pairs of fields that must both reach
+        # their minimum score, and (field count, minimum score) rules
+        self.STRONG_MATCH_PAIRS = [
+            (('full_name', 85.0), ('dob', 90.0)),    # Very high name and date
+            (('full_name', 95.0), ('dob', 80.0)),    # Excellent name with good date
+            (('dob', 100.0), ('full_name', 80.0)),   # Perfect date with very good name
+            (('email', 98.0), ('full_name', 75.0)),  # Email with a good name
+            (('email', 98.0), ('dob', 85.0))         # Email with a good date
+        ]
+        self.STRONG_MATCH_FIELD_COUNTS = [(3, 85.0), (2, 95.0)]
+        
+        # High-confidence fields (scoring at least MIN_SCORES['good_match']) a good match needs
+        self.GOOD_MATCH_MIN_FIELDS = 2
+        
+        # Every accepted match other than a perfect ID score has at least ACCEPT_MIN_FIELDS
+        # fields scoring ACCEPT_FIELD_SCORE or more, so records that can no longer get there
+        # stop being scored. Both are derived from the acceptance rules above
+        self.ACCEPT_MIN_FIELDS = min([self.GOOD_MATCH_MIN_FIELDS] +
+                                     [len(pair) for pair in self.STRONG_MATCH_PAIRS] +
+                                     [count for count, _ in self.STRONG_MATCH_FIELD_COUNTS])
+        self.ACCEPT_FIELD_SCORE = min([self.MIN_SCORES['good_match']] +
+                                      [score for pair in self.STRONG_MATCH_PAIRS for _, score in pair] +
+                                      [score for _, score in self.STRONG_MATCH_FIELD_COUNTS])
+        
+        # Order query fields are scored in: IDs first, then cheapest to score, so the
+        # expensive name scoring only runs for records that can still be accepted
+        self.FIELD_SCORING_ORDER = ['national_id', 'dob', 'phone', 'email', 'full_name']
+        
+        # Sources with at least this many records are blocked before fuzzy scoring:
+        # only records sharing a name-token prefix, DOB year, ID prefix/suffix, email
+        # or phone suffix with the query are scored
+        self.BLOCKING_MIN_RECORDS = 1000
+        self._block_indexes = {}
+        
+        # Exact-value hash indexes for the identifying fields
+        self.EXACT_INDEX_FIELDS = ['national_id', 'email']
+        self._exact_indexes = {}
+        
+        # Column name terms used to find a field's source columns when the schema
+        # mapping has none: field -> (terms to look for, terms that exclude a column)
+        self.FIELD_COLUMN_TERMS = {
+            'full_name': (['full_name', 'name'], ['source_name']),
+            'national_id': (['id', 'customer_id', 'national_id'], ['source_name']),
+            'dob': (['dob', 'birth', 'date_of_birth'], []),
+            'email': (['email'], []),
+            'phone': (['phone', 'mobile', 'telephone'], []),
+            'address': (['address'], [])
+        }
+        
+        # Unified field -> source columns, resolved once per source and column layout
+        self._column_maps = {}
+        
+        # Normalized source columns, prepared once per loaded DataFrame
+        self._prepared_sources = {}
+        
+        # Loaded processed data, reused while the source files are unchanged
+        self._data_cache = None
+        self._data_signature = None
+        
+        # Finds every full name and nickname in a query name in a single pass
+        self._nickname_automaton = self._build_nickname_automaton()
+        
+        self._init_cache()
+        
+        # Field-specific scorers and normalizers, resolved once rather than on every call
+        self._field_scorers = {
+            'national_id': self._score_ids,
+            'full_name': self._score_names,
+            'dob': self._score_dates,
+            'email': self._score_emails,
+            'phone': self._score_phones
+        }
+        self._field_normalizers = {
+            'national_id': self._normalize_id,
+            'full_name': self._normalize_name,
+            'email': self._normalize_email,
+            'phone': self._normalize_phone
         }
         
         self._ensure_directories()
         self._load_schema_mappings()
         logger.info("Profile Matching Agent initialized")
     
+    def _init_cache(self):
+        """Initialize LRU caches for the field normalizers, nickname lookups and Soundex codes."""
+        self._normalize_name = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_name)
+        self._normalize_date = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_date)
+        self._normalize_phone = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_phone)
+        self._normalize_email = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_email)
+        self._normalize_id = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_id)
+        self._nickname_targets = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._nickname_targets)
+        self._soundex = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._soundex)
+    
     def _ensure_directories(self):
         """Ensure required directories exist."""
         Path(self.processed_data_dir).mkdir(parents=True, exist_ok=True)
@@ -164,8 +334,7 @@ class ProfileMatchingAgent:
         
         if schema_file.exists():
             try:
-                with open(schema_file, 'r') as f:
-                    schema = json.load(f)
+                schema = self._read_json_file(schema_file)
                 logger.info(f"Loaded unified schema with {len(schema)} fields")
                 return schema
             except Exception as e:
@@ -188,16 +357,32 @@ class ProfileMatchingAgent:
             "raw_text": ""
         }
     
+    def _read_json_file(self, file_path: Path):
+        """
+        Read a JSON file, with orjson when it is installed.
+        
+        Args:
+            file_path (Path): Path of the JSON file
+            
+        Returns:
+            The parsed JSON document
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.loads(file_path.read_bytes())
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    
     def _load_schema_mappings(self):
         """Load all schema mapping files from the schema_mappings directory."""
         logger.info(f"Loading schema mappings from: {self.schema_mappings_dir}")
         
         mapping_dir = Path(self.schema_mappings_dir)
+        read_files = set()
         # Enhanced agent uses *_map.json naming convention
         for mapping_file in mapping_dir.glob("*_map.json"):
+            read_files.add(mapping_file)
             try:
-                with open(mapping_file, 'r') as f:
-                    mapping = json.load(f)
+                mapping = self._read_json_file(mapping_file)
                 source_name = mapping['source_name']
                 self.schema_mappings[source_name] = mapping
                 logger.info(f"Loaded schema mapping for {source_name}")
@@ -206,15 +391,32 @@ class ProfileMatchingAgent:
                 
         # Also try legacy naming for backward compatibility
         for mapping_file in mapping_dir.glob("*_schema_map.json"):
+            # *_schema_map.json files also match *_map.json, don't parse them twice
+            if mapping_file in read_files:
+                continue
             try:
-                with open(mapping_file, 'r') as f:
-                    mapping = json.load(f)
+                mapping = self._read_json_file(mapping_file)
                 source_name = mapping['source_name']
                 if source_name not in self.schema_mappings:  # Don't override enhanced mappings
                     self.schema_mappings[source_name] = mapping
                     logger.info(f"Loaded legacy schema mapping for {source_name}")
             except Exception as e:
                 logger.error(f"Failed to load legacy schema mapping from {mapping_file}: {str(e)}")
+        
+        self._build_reverse_mappings()
+    
+    def _build_reverse_mappings(self):
+        """Index the loaded schema mappings by unified field for each source."""
+        self._reverse_mappings = {}
+        
+        for source_name, mapping in self.schema_mappings.items():
+            # Enhanced agent mapping structure, or the legacy one for backward compatibility
+            field_mappings = mapping.get('field_mappings', {}) or mapping.get('mappings', {})
+            
+            reverse_mapping = defaultdict(list)
+            for source_field, mapping_info in field_mappings.items():
+                reverse_mapping[mapping_info.get('unified_field')].append(source_field)
+            self._reverse_mappings[source_name] = dict(reverse_mapping)
     
     def _get_field_mapping(self, source_name: str, unified_field: str) -> List[str]:
         """
@@ -227,25 +429,7 @@ class ProfileMatchingAgent:
         Returns:
             List[str]: List of source field names that map to the unified field
         """
-        mapping = self.schema_mappings.get(source_name, {})
-        
-        # Handle enhanced agent mapping structure
-        field_mappings = mapping.get('field_mappings', {})
-        if field_mappings:
-            source_fields = []
-            for source_field, mapping_info in field_mappings.items():
-                if mapping_info.get('unified_field') == unified_field:
-                    source_fields.append(source_field)
-            return source_fields
-        
-        # Handle legacy mapping structure for backward compatibility
-        mappings = mapping.get('mappings', {})
-        source_fields = []
-        for source_field, mapping_info in mappings.items():
-            if mapping_info.get('unified_field') == unified_field:
-                source_fields.append(source_field)
-        
-        return source_fields
+        return list(self._reverse_mappings.get(source_name, {}).get(unified_field, []))
     
     def _normalize_name(self, name: str) -> str:
         """
@@ -264,7 +448,7 @@ class ProfileMatchingAgent:
         name = ' '.join(name.lower().split())
         
         # Remove special characters but keep spaces and hyphens
-        name = re.sub(r'[^a-z0-9\s\-]', '', name)
+        name = NAME_STRIP_RE.sub('', name)
         
         # Remove common suffixes and prefixes
         words = name.split()
@@ -310,12 +494,29 @@ class ProfileMatchingAgent:
             
         try:
             # Remove all non-digit characters
-            digits = re.sub(r'\D', '', phone)
+            digits = NON_DIGIT_RE.sub('', phone)
+            if not digits or len(digits) > PHONE_MAX_DIGITS:
+                return None
+            
+            # A number written with its country code needs a single parse
+            if phone.lstrip().startswith('+'):
+                try:
+                    number = phonenumbers.parse(phone)
+                    if phonenumbers.is_valid_number(number):
+                        return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+                except phonenumbers.NumberParseException:
+                    pass
             
             # Try to parse with different country codes if needed
-            for country_code in ['1', '44', '91']:  # US, UK, India
+            for country_code in [1, 44, 91]:  # US, UK, India
                 try:
-                    number = phonenumbers.parse(f"+{country_code}{digits}")
+                    if digits[0] in '01':
+                        # A leading 0/1 may be a national prefix, let the parser strip it
+                        number = phonenumbers.parse(f"+{country_code}{digits}")
+                    else:
+                        # Nothing to strip, build the number without parsing the string
+                        number = phonenumbers.PhoneNumber(country_code=country_code,
+                                                          national_number=int(digits))
                     if phonenumbers.is_valid_number(number):
                         return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
                 except:
@@ -359,53 +560,59 @@ class ProfileMatchingAgent:
             return ""
             
         # Remove spaces and special characters
-        return re.sub(r'[^a-zA-Z0-9]', '', id_str.lower())
+        return ID_STRIP_RE.sub('', id_str.lower())
     
-    def _calculate_name_score(self, query_name: str, record_name: str) -> float:
+    def _score_names(self, query_name: str, record_names: np.ndarray) -> np.ndarray:
         """
-        Calculate similarity score between two names with nickname and variation support.
+        Calculate similarity scores between a query name and a column of record names
+        with nickname and variation support.
         
         Args:
             query_name (str): Query name
-            record_name (str): Record name
+            record_names (np.ndarray): Normalized record names to compare against
             
         Returns:
-            float: Similarity score (0-100)
+            np.ndarray: Similarity scores (0-100), one per record
         """
-        # Normalize names
-        query_name = self._normalize_name(query_name)
-        record_name = self._normalize_name(record_name)
-        
-        if not query_name or not record_name:
-            return 0.0
+        scores = np.zeros(len(record_names))
         
-        # Try different matching strategies
-        scores = []
-        
-        # 1. Direct fuzzy matching
-        scores.append(fuzz.ratio(query_name, record_name))
-        scores.append(fuzz.token_sort_ratio(query_name, record_name))
-        scores.append(fuzz.token_set_ratio(query_name, record_name))
-        scores.append(fuzz.partial_ratio(query_name, record_name))
-        scores.append(SequenceMatcher(None, query_name, record_name).ratio() * 100)
+        # Normalize query name
+        query_name = self._normalize_name(query_name)
         
-        # 2. Nickname and variation matching
-        nickname_score = self._calculate_nickname_score(query_name, record_name)
-        if nickname_score > 0:
-            scores.append(nickname_score)
+        if not query_name or not len(record_names):
+            return scores
         
-        # 3. First name + last initial matching (e.g., "Leonardo DiCaprio" vs "Leo D")
-        initial_score = self._calculate_name_initial_score(query_name, record_name)
-        if initial_score > 0:
-            scores.append(initial_score)
+        # 1. Direct fuzzy matching, scored against the whole column in one call per scorer.
+        # token_set_ratio covers reordered and subset names, partial_ratio embedded ones
+        for scorer in (fuzz.token_set_ratio, fuzz.partial_ratio):
+            np.maximum(scores, process.cdist([query_name], record_names, scorer=scorer,
+                                             dtype=np.float64, workers=-1)[0], out=scores)
         
-        # 4. Word-level partial matching for compound names
-        word_score = self._calculate_word_level_score(query_name, record_name)
-        if word_score > 0:
-            scores.append(word_score)
+        for idx, record_name in enumerate(record_names):
+            if not record_name:
+                scores[idx] = 0.0
+                continue
+            
+            # Skip the Python-level checks that cannot beat the fuzzy score:
+            # nothing beats 100, and nickname (95) / initial (90) matches cannot beat 95
+            if scores[idx] >= 100.0:
+                continue
+            
+            if scores[idx] < 95.0:
+                # 2. Nickname and variation matching
+                nickname_score = self._calculate_nickname_score(query_name, record_name)
+                if nickname_score:
+                    scores[idx] = max(scores[idx], nickname_score)
+                else:
+                    # 3. First name + last initial matching (e.g., "Leonardo DiCaprio" vs "Leo D"),
+                    # only needed when there is no nickname match to beat it
+                    scores[idx] = max(scores[idx], self._calculate_name_initial_score(query_name, record_name))
+            
+            # 4. Word-level partial matching for compound names
+            scores[idx] = max(scores[idx], self._calculate_word_level_score(query_name, record_name))
         
-        # Return the highest score
-        return max(scores)
+        return scores
+    
     
     def _calculate_nickname_score(self, query_name: str, record_name: str) -> float:
         """
@@ -418,25 +625,75 @@ class ProfileMatchingAgent:
         Returns:
             float: Nickname similarity score (0-100)
         """
-        # Check direct nickname matches
-        nicknames = self.NAME_PATTERNS['nicknames']
-        
-        # Check if query matches any nickname of record
-        for full_name, nickname_list in nicknames.items():
-            if full_name in record_name.lower():
-                for nickname in nickname_list:
-                    if nickname in query_name.lower():
-                        return 95.0  # High score for nickname match
+        record_name = record_name.lower()
         
-        # Check reverse - if record matches any nickname of query
-        for full_name, nickname_list in nicknames.items():
-            if full_name in query_name.lower():
-                for nickname in nickname_list:
-                    if nickname in record_name.lower():
-                        return 95.0  # High score for nickname match
+        # Check if the record contains any name that makes it a nickname match for the query
+        for target in self._nickname_targets(query_name):
+            if target in record_name:
+                return 95.0  # High score for nickname match
         
         return 0.0
     
+    def _nickname_targets(self, query_name: str) -> Tuple[str, ...]:
+        """
+        Find the names whose presence in a record name makes it a nickname match.
+        
+        The nickname table is scanned once per query name rather than once per record.
+        
+        Args:
+            query_name (str): Query name
+            
+        Returns:
+            Tuple[str, ...]: Full names of nicknames used in the query, and nicknames of
+            full names used in the query
+        """
+        query_name = query_name.lower()
+        targets = []
+        
+        if self._nickname_automaton is not None:
+            for _, (full_names, nicknames) in self._nickname_automaton.iter(query_name):
+                targets.extend(full_names)
+                targets.extend(nicknames)
+            return tuple(dict.fromkeys(targets))
+        
+        for full_name, nickname_list in self.NAME_PATTERNS['nicknames'].items():
+            # Query uses a nickname -> record should contain the full name
+            if any(nickname in query_name for nickname in nickname_list):
+                targets.append(full_name)
+            
+            # Query uses the full name -> record should contain one of its nicknames
+            if full_name in query_name:
+                targets.extend(nickname_list)
+        
+        return tuple(dict.fromkeys(targets))
+    
+    def _build_nickname_automaton(self):
+        """
+        Build an Aho-Corasick automaton over every full name and nickname.
+        
+        Each word maps to the full names it is a nickname of and the nicknames it is
+        the full name of, i.e. the targets its presence in a query name adds.
+        
+        Returns:
+            Optional[ahocorasick.Automaton]: The automaton, or None if pyahocorasick
+            is not installed
+        """
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        
+        entries = defaultdict(lambda: ([], []))
+        for full_name, nickname_list in self.NAME_PATTERNS['nicknames'].items():
+            entries[full_name][1].extend(nickname_list)
+            for nickname in nickname_list:
+                entries[nickname][0].append(full_name)
+        
+        automaton = ahocorasick.Automaton()
+        for word, (full_names, nicknames) in entries.items():
+            automaton.add_word(word, (tuple(full_names), tuple(nicknames)))
+        automaton.make_automaton()
+        
+        return automaton
+    
     def _calculate_name_initial_score(self, query_name: str, record_name: str) -> float:
         """
         Calculate score for name + initial matching (e.g., "Leonardo DiCaprio" vs "Leo D").
@@ -463,16 +720,17 @@ class ProfileMatchingAgent:
         
         # Try matching first name + last initial
         if len(query_words) >= 2 and len(record_words) >= 2:
-            # Check first name similarity and last initial
-            first_name_score = max(
-                fuzz.ratio(query_words[0], record_words[0]),
-                self._calculate_nickname_score(query_words[0], record_words[0])
-            )
+            # Check if last names start with same letter before scoring first names
+            if query_words[-1][0].lower() != record_words[-1][0].lower():
+                return 0.0
             
-            # Check if last names start with same letter
-            last_initial_match = (query_words[-1][0].lower() == record_words[-1][0].lower())
+            # Check first name similarity; only whether it reaches 80 matters, so
+            # rapidfuzz can stop early below that
+            first_name_score = fuzz.ratio(query_words[0], record_words[0], score_cutoff=80)
+            if first_name_score < 80:
+                first_name_score = self._calculate_nickname_score(query_words[0], record_words[0])
             
-            if first_name_score >= 80 and last_initial_match:
+            if first_name_score >= 80:
                 return 90.0  # High score for name + initial match
         
         return 0.0
@@ -494,443 +752,843 @@ class ProfileMatchingAgent:
         if not query_words or not record_words:
             return 0.0
         
-        # Find best matching words
-        word_scores = []
+        # Find best matching words, keeping a running best per query word. Passing it as
+        # score_cutoff lets rapidfuzz give up early on words that cannot beat it
+        total_score = 0.0
         for q_word in query_words:
-            best_score = 0
+            best_score = 0.0
             for r_word in record_words:
-                score = max(
-                    fuzz.ratio(q_word, r_word),
-                    self._calculate_nickname_score(q_word, r_word)
-                )
-                best_score = max(best_score, score)
-            word_scores.append(best_score)
+                best_score = max(best_score, fuzz.ratio(q_word, r_word, score_cutoff=best_score))
+                if best_score < 95.0:
+                    best_score = max(best_score, self._calculate_nickname_score(q_word, r_word))
+                if best_score >= 100.0:
+                    break
+            total_score += best_score
         
         # Return average of best word matches
-        if word_scores:
-            return sum(word_scores) / len(word_scores)
-        
-        return 0.0
+        return total_score / len(query_words)
     
-    def _calculate_date_score(self, query_date: str, record_date: str) -> float:
+    def _score_dates(self, query_date: str, record_days: np.ndarray) -> np.ndarray:
         """
-        Calculate similarity score between two dates.
+        Calculate similarity scores between a query date and a column of record dates.
         
         Args:
             query_date (str): Query date
-            record_date (str): Record date
+            record_days (np.ndarray): Record dates as day numbers (MISSING_DAYS if invalid)
             
         Returns:
-            float: Similarity score (0-100)
+            np.ndarray: Similarity scores (0-100), one per record
         """
-        # Normalize dates
-        query_date = self._normalize_date(query_date)
-        record_date = self._normalize_date(record_date)
+        scores = np.zeros(len(record_days))
         
-        if not query_date or not record_date:
-            return 0.0
+        # Normalize query date
+        query_day = self._normalize_values('dob', [query_date])[0]
         
-        # Exact match
-        if query_date == record_date:
-            return 100.0
+        if query_day == MISSING_DAYS or not len(record_days):
+            return scores
         
-        # Parse dates for comparison
-        try:
-            query_dt = datetime.strptime(query_date, '%Y-%m-%d')
-            record_dt = datetime.strptime(record_date, '%Y-%m-%d')
-            
-            # Calculate date difference in days
-            date_diff = abs((query_dt - record_dt).days)
-            
-            # Score based on date difference
-            if date_diff == 0:
-                return 100.0
-            elif date_diff <= 1:
-                return 90.0
-            elif date_diff <= 7:
-                return 80.0
-            elif date_diff <= 30:
-                return 60.0
-            elif date_diff <= 365:
-                return 40.0
-            else:
-                return 0.0
-        except:
-            return 0.0
+        # Score based on date difference in days: 0, 1, <=7, <=30, <=365, more.
+        # side='left' keeps a difference equal to an edge in that edge's bucket
+        valid = record_days != MISSING_DAYS
+        date_diff = np.abs(record_days[valid] - query_day)
+        scores[valid] = DATE_DIFF_SCORES[np.searchsorted(DATE_DIFF_DAYS, date_diff, side='left')]
+        
+        return scores
     
-    def _calculate_id_score(self, query_id: str, record_id: str) -> float:
+    def _score_ids(self, query_id: str, record_ids: np.ndarray) -> np.ndarray:
         """
-        Calculate similarity score between two IDs.
+        Calculate similarity scores between a query ID and a column of record IDs.
         
         Args:
             query_id (str): Query ID
-            record_id (str): Record ID
+            record_ids (np.ndarray): Normalized record IDs to compare against
             
         Returns:
-            float: Similarity score (0-100)
+            np.ndarray: Similarity scores (0-100), one per record
         """
-        # Normalize IDs
-        query_id = self._normalize_id(query_id)
-        record_id = self._normalize_id(record_id)
-        
-        if not query_id or not record_id:
-            return 0.0
+        scores = np.zeros(len(record_ids))
         
-        # Exact match
-        if query_id == record_id:
-            return 100.0
-        
-        # Try different matching strategies
-        scores = []
+        # Normalize query ID
+        query_id = self._normalize_id(query_id)
         
-        # Full string ratio
-        scores.append(fuzz.ratio(query_id, record_id))
+        if not query_id or not len(record_ids):
+            return scores
         
-        # Partial ratio (for cases where ID might be embedded in a longer string)
-        scores.append(fuzz.partial_ratio(query_id, record_id))
+        # Full string ratio and partial ratio (ID embedded in a longer string)
+        for scorer in (fuzz.ratio, fuzz.partial_ratio):
+            np.maximum(scores, process.cdist([query_id], record_ids, scorer=scorer,
+                                             dtype=np.float64, workers=-1)[0], out=scores)
         
-        # Token sort ratio (for cases where ID parts might be in different order)
-        scores.append(fuzz.token_sort_ratio(query_id, record_id))
+        scores[record_ids == ''] = 0.0
         
-        # Check for common ID patterns
-        if len(query_id) == len(record_id):
-            # If same length, give higher weight to character-level similarity
-            scores.append(SequenceMatcher(None, query_id, record_id).ratio() * 100)
+        # Exact match
+        scores[record_ids == query_id] = 100.0
         
-        return max(scores)
+        return scores
     
-    def _calculate_email_score(self, query_email: str, record_email: str) -> float:
+    
+    def _score_emails(self, query_email: str, record_emails: np.ndarray) -> np.ndarray:
         """
-        Calculate similarity score between two email addresses.
+        Calculate similarity scores between a query email and a column of record emails.
         
         Args:
             query_email (str): Query email
-            record_email (str): Record email
+            record_emails (np.ndarray): Normalized record emails ('' if invalid) to compare against
             
         Returns:
-            float: Similarity score (0-100)
+            np.ndarray: Similarity scores (0-100), one per record
         """
-        # Normalize emails
-        query_email = self._normalize_email(query_email)
-        record_email = self._normalize_email(record_email)
+        scores = np.zeros(len(record_emails))
         
-        if not query_email or not record_email:
-            return 0.0
+        # Normalize query email
+        query_email = self._normalize_email(query_email)
         
-        # Exact match
-        if query_email == record_email:
-            return 100.0
+        if not query_email or not len(record_emails):
+            return scores
         
         # Split into local and domain parts
-        query_local, query_domain = query_email.split('@')
-        record_local, record_domain = record_email.split('@')
+        query_local, _, query_domain = query_email.rpartition('@')
+        record_parts = [email.rpartition('@') for email in record_emails]
         
         # Calculate scores for local and domain parts
-        local_score = fuzz.ratio(query_local, record_local)
-        domain_score = fuzz.ratio(query_domain, record_domain)
+        local_scores = process.cdist([query_local], [parts[0] for parts in record_parts],
+                                     scorer=fuzz.ratio, dtype=np.float64, workers=-1)[0]
+        domain_scores = process.cdist([query_domain], [parts[2] for parts in record_parts],
+                                      scorer=fuzz.ratio, dtype=np.float64, workers=-1)[0]
         
         # Weight domain match more heavily
-        return (local_score * 0.4 + domain_score * 0.6)
+        scores = local_scores * 0.4 + domain_scores * 0.6
+        
+        scores[record_emails == ''] = 0.0
+        
+        # Exact match
+        scores[record_emails == query_email] = 100.0
+        
+        return scores
     
-    def _calculate_phone_score(self, query_phone: str, record_phone: str) -> float:
+    
+    def _score_phones(self, query_phone: str, record_phones: np.ndarray) -> np.ndarray:
         """
-        Calculate similarity score between two phone numbers.
+        Calculate similarity scores between a query phone and a column of record phones.
         
         Args:
             query_phone (str): Query phone
-            record_phone (str): Record phone
+            record_phones (np.ndarray): Normalized record phones ('' if invalid) to compare against
             
         Returns:
-            float: Similarity score (0-100)
+            np.ndarray: Similarity scores (0-100), one per record
         """
-        # Normalize phone numbers
+        scores = np.zeros(len(record_phones))
+        
+        # Normalize query phone number
         query_phone = self._normalize_phone(query_phone)
-        record_phone = self._normalize_phone(record_phone)
         
-        if not query_phone or not record_phone:
-            return 0.0
+        if not query_phone or not len(record_phones):
+            return scores
         
-        # Exact match
-        if query_phone == record_phone:
-            return 100.0
+        # Full string ratio and partial ratio (number embedded in a longer string)
+        for scorer in (fuzz.ratio, fuzz.partial_ratio):
+            np.maximum(scores, process.cdist([query_phone], record_phones, scorer=scorer,
+                                             dtype=np.float64, workers=-1)[0], out=scores)
         
-        # Try different matching strategies
-        scores = []
+        record_phones = np.asarray(record_phones, dtype=str)
+        scores[record_phones == ''] = 0.0
         
-        # Full string ratio
-        scores.append(fuzz.ratio(query_phone, record_phone))
+        # Last 7 digits are the most important part of a phone number
+        if len(query_phone) >= 7:
+            last_seven = (np.char.str_len(record_phones) >= 7) & \
+                np.char.endswith(record_phones, query_phone[-7:])
+            scores[last_seven] = np.maximum(scores[last_seven], 90.0)
         
-        # Partial ratio (for cases where number might be embedded in a longer string)
-        scores.append(fuzz.partial_ratio(query_phone, record_phone))
+        # Exact match
+        scores[record_phones == query_phone] = 100.0
         
-        # Check last 7 digits (most important part of phone number)
-        if len(query_phone) >= 7 and len(record_phone) >= 7:
-            query_last7 = query_phone[-7:]
-            record_last7 = record_phone[-7:]
-            if query_last7 == record_last7:
-                scores.append(90.0)
+        return scores
+    
+    
+    def _resolve_source_fields(self, source_name: str, field: str, columns: List[str]) -> List[str]:
+        """
+        Resolve the source columns to compare against for a unified query field.
         
-        return max(scores)
+        Args:
+            source_name (str): Name of the source for schema mapping lookup
+            field (str): Unified schema field name
+            columns (List[str]): Columns available in the source records
+            
+        Returns:
+            List[str]: Source columns holding values for the unified field
+        """
+        # Get all source fields that map to this unified field
+        source_fields = self._get_field_mapping(source_name, field)
+        
+        # Filter out mapped fields that don't actually exist in the records
+        existing_source_fields = [sf for sf in source_fields if sf in columns]
+        if existing_source_fields:
+            return existing_source_fields
+        
+        # If no valid schema mapping found, try direct field matching
+        logger.debug(f"No schema mapping found for {field}, trying direct match")
+        if field in columns:
+            logger.debug(f"Using direct field match: {field}")
+            return [field]
+        
+        # Otherwise sniff the column names for field-related terms
+        terms, excluded_terms = self.FIELD_COLUMN_TERMS.get(field, ([], []))
+        source_fields = [
+            col for col in columns
+            if any(term in col.lower() for term in terms)
+            and not any(term in col.lower() for term in excluded_terms)
+        ]
+        
+        if source_fields:
+            logger.debug(f"Found {field} columns: {source_fields}")
+        else:
+            logger.debug(f"Field {field} not found in record columns: {columns}")
+        
+        return source_fields
     
-    def _calculate_match_score(self, query: Dict[str, str], 
-                             record: Dict[str, str],
-                             source_name: str) -> Tuple[float, Dict[str, float]]:
+    def _resolve_source_columns(self, source_name: str, columns: List[str]) -> Dict[str, List[str]]:
         """
-        Calculate overall match score between query and record.
+        Get the source columns of every weighted field, resolving them once per source.
         
         Args:
-            query (Dict[str, str]): Search query
-            record (Dict[str, str]): Record to compare against
             source_name (str): Name of the source for schema mapping lookup
+            columns (List[str]): Columns available in the source records
             
         Returns:
-            Tuple[float, Dict[str, float]]: Overall match score and individual field scores
+            Dict[str, List[str]]: Unified field -> source columns holding its values
         """
-        field_scores = {}
+        layout = tuple(columns)
+        cached = self._column_maps.get(source_name)
+        if cached is None or cached[0] != layout:
+            column_map = {
+                field: self._resolve_source_fields(source_name, field, columns)
+                for field in self.MATCH_WEIGHTS
+            }
+            cached = (layout, column_map)
+            self._column_maps[source_name] = cached
+        return cached[1]
+    
+    def _score_source(self, query: Dict[str, str], prepared: Dict[str, List[np.ndarray]],
+                      num_records: int,
+                      exact_rows: Optional[Dict[str, np.ndarray]] = None,
+                      prune: bool = False) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Calculate overall match scores between the query and every record of a source.
         
-        # Get schema mapping for this source
-        mapping = self.schema_mappings.get(source_name, {})
-        mappings = mapping.get('mappings', {})
+        Each field is scored against the whole normalized source column at once, so the
+        fuzzy scorers run over complete columns instead of one record at a time.
         
-        logger.debug(f"Calculating match score for {source_name}")
+        Args:
+            query (Dict[str, str]): Search query
+            prepared (Dict[str, List[np.ndarray]]): Normalized source columns per unified field
+            num_records (int): Number of records in the prepared columns
+            exact_rows (Optional[Dict[str, np.ndarray]]): Per field, a mask of the records
+                known to match the query value exactly
+            prune (bool): Stop scoring records once they can no longer be accepted as a
+                match; their scores are then only partial
+            
+        Returns:
+            Tuple[np.ndarray, Dict[str, np.ndarray]]: Overall match score per record and
+            individual field scores per record (0.0 where a field did not match)
+        """
+        field_scores = {}
+        
+        logger.debug(f"Calculating match scores for {num_records} records")
         logger.debug(f"Query: {query}")
-        logger.debug(f"Record: {record}")
-        logger.debug(f"Available mappings: {list(mappings.keys()) if mappings else 'None'}")
         
         # Calculate scores for each query field
-        for field, value in query.items():
+        scored_fields = []
+        for field in query:
             if field not in self.MATCH_WEIGHTS:
                 logger.debug(f"Skipping field {field} - not in MATCH_WEIGHTS")
-                continue
-                
-            # Get all source fields that map to this unified field
-            source_fields = self._get_field_mapping(source_name, field)
-            
-            # Filter out mapped fields that don't actually exist in the record
-            existing_source_fields = [sf for sf in source_fields if sf in record]
-            
-            # If no valid schema mapping found, try direct field matching
-            if not existing_source_fields:
-                logger.debug(f"No schema mapping found for {field}, trying direct match")
-                if field in record:
-                    source_fields = [field]
-                    logger.debug(f"Using direct field match: {field}")
-                elif field == 'full_name':
-                    # For full_name, check all name-related columns
-                    name_columns = [col for col in record.keys() if any(name_term in col.lower() for name_term in ['full_name', 'name']) and 'source_name' not in col.lower()]
-                    if name_columns:
-                        source_fields = name_columns
-                        logger.debug(f"Found name columns: {name_columns}")
-                elif field == 'national_id':
-                    # For national_id, check customer_id and id-related columns  
-                    id_columns = [col for col in record.keys() if any(id_term in col.lower() for id_term in ['id', 'customer_id', 'national_id']) and 'source_name' not in col.lower()]
-                    if id_columns:
-                        source_fields = id_columns
-                        logger.debug(f"Found ID columns: {id_columns}")
-                elif field == 'dob':
-                    # For dob, check date-related columns
-                    date_columns = [col for col in record.keys() if any(date_term in col.lower() for date_term in ['dob', 'birth', 'date_of_birth'])]
-                    if date_columns:
-                        source_fields = date_columns
-                        logger.debug(f"Found date columns: {date_columns}")
-                elif field == 'email':
-                    # For email, check email-related columns
-                    email_columns = [col for col in record.keys() if 'email' in col.lower()]
-                    if email_columns:
-                        source_fields = email_columns
-                        logger.debug(f"Found email columns: {email_columns}")
-                elif field == 'phone':
-                    # For phone, check phone-related columns
-                    phone_columns = [col for col in record.keys() if any(phone_term in col.lower() for phone_term in ['phone', 'mobile', 'telephone'])]
-                    if phone_columns:
-                        source_fields = phone_columns
-                        logger.debug(f"Found phone columns: {phone_columns}")
-                elif field == 'address':
-                    # For address, check address-related columns
-                    address_columns = [col for col in record.keys() if 'address' in col.lower()]
-                    if address_columns:
-                        source_fields = address_columns
-                        logger.debug(f"Found address columns: {address_columns}")
-                
-                if not source_fields:
-                    logger.debug(f"Field {field} not found in record columns: {list(record.keys())}")
-                    continue
+            elif field not in prepared:
+                logger.debug(f"Field {field} not found in source columns")
             else:
-                # Use the existing valid mapped fields
-                source_fields = existing_source_fields
+                scored_fields.append(field)
+        
+        # An exact ID match is an immediate strong match, so IDs are scored first
+        # and the other fields are only scored for the records without one
+        scored_fields.sort(key=self.FIELD_SCORING_ORDER.index)
+        id_matched = None
+        best_scores = {}
+        confident_fields = np.zeros(num_records, dtype=np.int64)
+        
+        for position, field in enumerate(scored_fields):
+            value = query[field]
+            score_field = self._field_scorers[field]
             
-            logger.debug(f"Matching field {field} using source fields: {source_fields}")
+            # Calculate score for each source column, keeping the best per record
+            field_score = np.zeros(num_records)
+            skip = id_matched
             
-            # Calculate score for each source field
-            field_score = 0.0
-            for source_field in source_fields:
-                if source_field not in record:
-                    logger.debug(f"Source field {source_field} not in record")
-                    continue
-                
-                record_value = str(record[source_field]) if record[source_field] is not None else ""
-                logger.debug(f"Comparing {field}: '{value}' vs '{record_value}'")
+            # A perfect ID score is accepted on its own, so IDs are never pruned
+            if prune and field != 'national_id':
+                fields_left = len(scored_fields) - position
+                hopeless = confident_fields + fields_left < self.ACCEPT_MIN_FIELDS
+                skip = hopeless if skip is None else skip | hopeless
+            
+            # Exact hits from the hash index score 100 without fuzzy matching
+            exact_mask = exact_rows.get(field) if exact_rows else None
+            if exact_mask is not None and exact_mask.any():
+                field_score[exact_mask] = 100.0
+                skip = exact_mask if skip is None else skip | exact_mask
+            
+            remaining = None if skip is None or not skip.any() else ~skip
+            
+            for record_values in prepared[field]:
+                if remaining is not None:
+                    record_values = record_values[remaining]
                 
                 # Calculate field-specific score
-                if field == 'national_id':
-                    score = self._calculate_id_score(value, record_value)
-                elif field == 'full_name':
-                    # For names, also try combining multiple name fields if this is a partial name
-                    if 'full_name' in source_field and len(source_fields) > 1:
-                        # Try to construct full name from multiple columns
-                        name_parts = []
-                        for name_col in source_fields:
-                            if name_col in record and record[name_col]:
-                                name_part = str(record[name_col]).strip()
-                                if name_part and name_part not in name_parts:
-                                    name_parts.append(name_part)
-                        
-                        if len(name_parts) > 1:
-                            combined_name = ' '.join(name_parts)
-                            combined_score = self._calculate_name_score(value, combined_name)
-                            logger.debug(f"Combined name '{combined_name}' score: {combined_score}")
-                            score = max(score, combined_score) if 'score' in locals() else combined_score
-                    
-                    individual_score = self._calculate_name_score(value, record_value)
-                    score = max(score, individual_score) if 'score' in locals() else individual_score
-                elif field == 'dob':
-                    score = self._calculate_date_score(value, record_value)
-                elif field == 'email':
-                    score = self._calculate_email_score(value, record_value)
-                elif field == 'phone':
-                    score = self._calculate_phone_score(value, record_value)
-                else:
-                    score = fuzz.ratio(value.lower(), record_value.lower())
-                
-                logger.debug(f"Score for {field} ({source_field}): {score}")
+                score = score_field(value, record_values)
                 
-                # Update field score if better
-                field_score = max(field_score, score)
+                # Update field score where better
+                if remaining is None:
+                    np.maximum(field_score, score, out=field_score)
+                else:
+                    field_score[remaining] = np.maximum(field_score[remaining], score)
+            
+            if field == 'national_id':
+                id_matched = field_score == 100.0
+            confident_fields += field_score >= self.ACCEPT_FIELD_SCORE
+            best_scores[field] = field_score
+        
+        # Store the best scores for each field, in query order
+        for field in query:
+            if field in best_scores and best_scores[field].any():
+                field_scores[field] = best_scores[field]
+        
+        # Calculate weighted average score over the fields each record scored on, as
+        # column sums of the field weights times the (fields x records) score matrix
+        if field_scores:
+            score_matrix = np.vstack(list(field_scores.values()))
+            weights = np.array([self.MATCH_WEIGHTS.get(field, 0) for field in field_scores])[:, np.newaxis]
+            weighted_sum = (weights * score_matrix).sum(axis=0)
+            total_weight = (weights * (score_matrix > 0)).sum(axis=0)
+        else:
+            weighted_sum = total_weight = np.zeros(num_records)
+        
+        overall_scores = np.divide(weighted_sum, total_weight,
+                                   out=np.zeros(num_records), where=total_weight > 0)
+        
+        return overall_scores, field_scores
+    
+    def score_dataframe(self, query: Dict[str, str], df: pd.DataFrame, source_name: str) -> pd.Series:
+        """
+        Calculate the overall match score of every record in a source DataFrame.
+    
+        Args:
+            query (Dict[str, str]): Search query
+            df (pd.DataFrame): Source records
+            source_name (str): Name of the source for schema mapping lookup
+    
+        Returns:
+            pd.Series: Overall match score per record, indexed like the DataFrame
+        """
+        prepared = self._get_prepared_source(source_name, df)
+    
+        exact_rows = {}
+        for field, rows in self._get_exact_rows(query, df, source_name).items():
+            exact_mask = np.zeros(len(df), dtype=bool)
+            exact_mask[rows] = True
+            exact_rows[field] = exact_mask
+    
+        match_scores, _ = self._score_source(query, prepared, len(df), exact_rows)
+        return pd.Series(match_scores, index=df.index, name='match_score')
+    
+    def _normalize_values(self, field: str, values: List[str]) -> np.ndarray:
+        """
+        Normalize a column of values for a unified field.
+        
+        Args:
+            field (str): Unified schema field name
+            values (List[str]): Raw values
             
-            # Store the best score for this field
-            if field_score > 0:
-                field_scores[field] = field_score
-                logger.debug(f"Final score for {field}: {field_score}")
+        Returns:
+            np.ndarray: Normalized values, '' where a value is missing or invalid.
+            Dates are returned as int64 day numbers, MISSING_DAYS where invalid,
+            and phones as a fixed-width string array.
+        """
+        if field == 'dob':
+            return self._date_days(self._normalize_dates(values))
+        
+        normalize = self._field_normalizers[field]
+        if field == 'phone':
+            # Fixed-width strings, so the numpy.char suffix checks need no conversion
+            return np.array([normalize(value) or "" for value in values], dtype=str)
+        return np.array([normalize(value) or "" for value in values], dtype=object)
+    
+    def _detect_date_format(self, dates: List[str]) -> Optional[str]:
+        """
+        Detect the date format of a column from a sample of its values.
         
-        # Calculate weighted average score
-        if not field_scores:
-            logger.debug("No field scores calculated")
-            return 0.0, field_scores
+        Args:
+            dates (List[str]): Raw date strings of one column
+            
+        Returns:
+            Optional[str]: strptime format matching the most sampled values, or None
+        """
+        sample = [date for date in dates if date][:DATE_FORMAT_SAMPLE_SIZE]
+        best_format, best_count = None, 0
         
-        total_weight = 0.0
-        weighted_sum = 0.0
+        for date_format in DATE_FORMATS:
+            count = 0
+            for date in sample:
+                try:
+                    datetime.strptime(date, date_format)
+                    count += 1
+                except ValueError:
+                    pass
+            
+            if count > best_count:
+                best_format, best_count = date_format, count
         
-        for field, score in field_scores.items():
-            weight = self.MATCH_WEIGHTS.get(field, 0)
-            total_weight += weight
-            weighted_sum += score * weight
-            logger.debug(f"Field {field}: score={score}, weight={weight}, contribution={score * weight}")
+        return best_format
+    
+    def _normalize_dates(self, dates: List[str]) -> List[Optional[str]]:
+        """
+        Normalize a column of date strings to YYYY-MM-DD.
+        
+        Dates within a column share a format, so it is detected once and parsed with
+        strptime; dateutil is only used for values that do not match it.
         
-        overall_score = weighted_sum / total_weight if total_weight > 0 else 0.0
-        logger.debug(f"Overall score: {overall_score} (weighted_sum={weighted_sum}, total_weight={total_weight})")
+        Args:
+            dates (List[str]): Raw date strings of one column
+            
+        Returns:
+            List[Optional[str]]: Normalized date strings, None where invalid
+        """
+        date_format = self._detect_date_format(dates)
+        normalized = []
+        
+        for date in dates:
+            if date and date_format:
+                try:
+                    normalized.append(datetime.strptime(date, date_format).strftime('%Y-%m-%d'))
+                    continue
+                except ValueError:
+                    pass
+            normalized.append(self._normalize_date(date))
         
-        return overall_score, field_scores
+        return normalized
     
-    def _is_strong_match(self, field_scores: Dict[str, float]) -> bool:
+    def _date_days(self, dates: List[Optional[str]]) -> np.ndarray:
         """
-        Determine if the match is strong based on field scores with strict criteria.
+        Convert normalized dates to day numbers so date differences can be computed on arrays.
         
         Args:
-            field_scores (Dict[str, float]): Individual field scores
+            dates (List[Optional[str]]): Normalized dates (YYYY-MM-DD) or None
             
         Returns:
-            bool: True if the match is considered strong
+            np.ndarray: Days since 1970-01-01 as int64, MISSING_DAYS where a date is missing
         """
-        # Perfect ID match always qualifies as strong
-        if 'national_id' in field_scores and field_scores['national_id'] == 100.0:
-            return True
+        try:
+            days = np.array([date or 'NaT' for date in dates], dtype='datetime64[D]')
+        except ValueError:
+            # Fall back to converting one by one so a single odd date does not fail the column
+            days = np.empty(len(dates), dtype='datetime64[D]')
+            for idx, date in enumerate(dates):
+                try:
+                    days[idx] = np.datetime64(date or 'NaT', 'D')
+                except ValueError:
+                    days[idx] = np.datetime64('NaT')
+        
+        return days.astype(np.int64)
+    
+    def _prepare_source(self, source_name: str, df: pd.DataFrame) -> Dict[str, List[np.ndarray]]:
+        """
+        Normalize every source column that is compared against a query field.
+        
+        Args:
+            source_name (str): Name of the source for schema mapping lookup
+            df (pd.DataFrame): Source records
+            
+        Returns:
+            Dict[str, List[np.ndarray]]: Unified field -> normalized values of each source
+            column mapped to it
+        """
+        column_map = self._resolve_source_columns(source_name, list(df.columns))
+        prepared = {}
         
-        # Check if we have both name and date scores with very high thresholds
-        if 'full_name' in field_scores and 'dob' in field_scores:
-            name_score = field_scores['full_name']
-            date_score = field_scores['dob']
+        for field, source_fields in column_map.items():
+            if not source_fields:
+                continue
             
-            # Strong match requires both name and date to be very high
-            if name_score >= 85.0 and date_score >= 90.0:
-                return True
+            # Only the referenced columns get their missing values replaced, not the whole frame
+            field_columns = [
+                self._normalize_values(field, [str(value) for value in df[source_field].fillna('').tolist()])
+                for source_field in source_fields
+            ]
             
-            # Alternative: excellent name with good date
-            if name_score >= 95.0 and date_score >= 80.0:
-                return True
+            # For names, also try combining multiple name fields if this is a partial name
+            if field == 'full_name' and len(source_fields) > 1 and \
+                    any('full_name' in source_field for source_field in source_fields):
+                field_columns.append(
+                    self._normalize_values(field, self._combine_name_columns(df[source_fields].fillna(''), source_fields))
+                )
             
-            # Alternative: perfect date with very good name
-            if date_score >= 100.0 and name_score >= 80.0:
-                return True
+            prepared[field] = field_columns
         
-        # Strong match with high-confidence unique identifiers
-        if 'email' in field_scores and field_scores['email'] >= 98.0:
-            # Email match must be combined with at least one other good field
-            if ('full_name' in field_scores and field_scores['full_name'] >= 75.0) or \
-               ('dob' in field_scores and field_scores['dob'] >= 85.0):
-                return True
+        return prepared
+    
+    def _get_prepared_source(self, source_name: str, df: pd.DataFrame) -> Dict[str, List[np.ndarray]]:
+        """
+        Get the normalized columns of a source, preparing them on first use.
         
-        # Strong match with multiple good fields (at least 3 fields with high scores)
-        high_score_count = sum(1 for score in field_scores.values() if score >= 85.0)
-        very_high_score_count = sum(1 for score in field_scores.values() if score >= 95.0)
+        Args:
+            source_name (str): Name of the source
+            df (pd.DataFrame): Source records
+            
+        Returns:
+            Dict[str, List[np.ndarray]]: Unified field -> normalized source columns
+        """
+        # Reuse the normalized columns while the same DataFrame is being searched
+        cached = self._prepared_sources.get(source_name)
+        if cached is None or cached[0] is not df:
+            cached = (df, self._prepare_source(source_name, df))
+            self._prepared_sources[source_name] = cached
         
-        # At least 3 fields with high scores OR 2 fields with very high scores
-        if high_score_count >= 3 or very_high_score_count >= 2:
-            return True
+        return cached[1]
+    
+    def _combine_name_columns(self, df: pd.DataFrame, name_columns: List[str]) -> List[str]:
+        """
+        Construct full names from multiple name columns of each record.
         
-        return False
+        Args:
+            df (pd.DataFrame): Source records, with missing values replaced by ''
+            name_columns (List[str]): Name-related columns to combine
+            
+        Returns:
+            List[str]: Combined name per record, or '' when fewer than two parts exist
+        """
+        combined_names = []
+        for row in zip(*(df[name_col].tolist() for name_col in name_columns)):
+            name_parts = []
+            for value in row:
+                if value:
+                    name_part = str(value).strip()
+                    if name_part and name_part not in name_parts:
+                        name_parts.append(name_part)
+            
+            combined_names.append(' '.join(name_parts) if len(name_parts) > 1 else "")
+        
+        return combined_names
+    
+    def _blocking_keys(self, field: str, value: str, expand_nicknames: bool = False) -> List[str]:
+        """
+        Generate the blocking keys for a normalized field value.
+        
+        Args:
+            field (str): Unified schema field name
+            value (str): Normalized field value (day number for dates)
+            expand_nicknames (bool): Also emit keys for known name variations (query side)
+            
+        Returns:
+            List[str]: Blocking keys for the value
+        """
+        if field == 'dob':
+            if value == MISSING_DAYS:
+                return []
+            return [f"dob:{np.datetime64(int(value), 'D').astype('datetime64[Y]').astype(np.int64) + 1970}"]
+        
+        if not value:
+            return []
+        
+        if field == 'full_name':
+            tokens = set(value.split())
+            if expand_nicknames:
+                for full_name, nickname_list in self.NAME_PATTERNS['nicknames'].items():
+                    full_tokens = set(full_name.split())
+                    nickname_tokens = {token for nickname in nickname_list for token in nickname.split()}
+                    if tokens & full_tokens:
+                        tokens |= nickname_tokens
+                    if tokens & nickname_tokens:
+                        tokens |= full_tokens
+            # Prefix keys catch typos late in a name, Soundex keys misspellings that sound
+            # alike (e.g. "jon"/"john", "smyth"/"smith")
+            return [f"name:{token[:3]}" for token in tokens] + \
+                [f"sndx:{code}" for code in map(self._soundex, tokens) if code]
+        
+        if field == 'national_id':
+            # IDs are often stored with a country/system prefix, so block on both ends
+            return [f"id:{value[:4]}", f"id:*{value[-4:]}"]
+        
+        if field == 'email':
+            return [f"email:{value}"]
+        
+        if field == 'phone':
+            return [f"phone:{value[-7:]}"]
+        
+        return []
+    
+    
+    def _soundex(self, token: str) -> str:
+        """
+        Compute the Soundex code of a name token.
+        
+        Args:
+            token (str): Lowercase name token
+            
+        Returns:
+            str: Four-character Soundex code, '' if the token has no letters
+        """
+        letters = [char for char in token if 'a' <= char <= 'z']
+        if not letters:
+            return ''
+        
+        code = letters[0]
+        previous = SOUNDEX_CODES.get(letters[0], '')
+        for char in letters[1:]:
+            digit = SOUNDEX_CODES.get(char, '')
+            if digit and digit != previous:
+                code += digit
+                if len(code) == 4:
+                    break
+            # h and w do not separate letters with the same code, vowels do
+            if char not in 'hw':
+                previous = digit
+        
+        return code.ljust(4, '0')
+    
+    def _build_blocks(self, prepared: Dict[str, List[np.ndarray]], source_name: str) -> Dict[str, np.ndarray]:
+        """
+        Build a blocking index mapping blocking keys to the rows that share them.
+        
+        Args:
+            prepared (Dict[str, List[np.ndarray]]): Normalized source columns per unified field
+            source_name (str): Name of the source
+            
+        Returns:
+            Dict[str, np.ndarray]: Blocking key -> sorted row indices
+        """
+        blocks = defaultdict(list)
+        
+        for field, field_columns in prepared.items():
+            for record_values in field_columns:
+                for idx, value in enumerate(record_values):
+                    for key in self._blocking_keys(field, value):
+                        blocks[key].append(idx)
+        
+        logger.info(f"Built blocking index for {source_name} with {len(blocks)} keys")
+        return {key: np.unique(rows) for key, rows in blocks.items()}
+    
+    def _get_candidate_rows(self, query: Dict[str, str], df: pd.DataFrame,
+                            source_name: str) -> Optional[np.ndarray]:
+        """
+        Find the rows of a source sharing at least one blocking key with the query.
+        
+        Args:
+            query (Dict[str, str]): Search query
+            df (pd.DataFrame): Source records
+            source_name (str): Name of the source for schema mapping lookup
+            
+        Returns:
+            Optional[np.ndarray]: Sorted candidate row indices, or None if every row
+            should be scored (small source or no blockable query field)
+        """
+        if len(df) < self.BLOCKING_MIN_RECORDS:
+            return None
+        
+        query_keys = [key for field, value in query.items() if field in self.MATCH_WEIGHTS and value
+                      for key in self._blocking_keys(field, self._normalize_values(field, [value])[0],
+                                                     expand_nicknames=True)]
+        if not query_keys:
+            return None
+        
+        # Reuse the index while the same DataFrame is being searched
+        cached = self._block_indexes.get(source_name)
+        if cached is None or cached[0] is not df:
+            cached = (df, self._build_blocks(self._get_prepared_source(source_name, df), source_name))
+            self._block_indexes[source_name] = cached
+        blocks = cached[1]
+        
+        candidate_rows = [blocks[key] for key in query_keys if key in blocks]
+        if not candidate_rows:
+            return np.empty(0, dtype=np.int64)
+        
+        return np.unique(np.concatenate(candidate_rows))
+    
+    
+    def _build_exact_index(self, prepared: Dict[str, List[np.ndarray]],
+                           source_name: str) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Build hash indexes mapping normalized identifying values to their rows.
+        
+        Args:
+            prepared (Dict[str, List[np.ndarray]]): Normalized source columns per unified field
+            source_name (str): Name of the source
+            
+        Returns:
+            Dict[str, Dict[str, np.ndarray]]: Field -> normalized value -> sorted row indices
+        """
+        indexes = {}
+        
+        for field in self.EXACT_INDEX_FIELDS:
+            index = defaultdict(list)
+            for record_values in prepared.get(field, []):
+                for idx, value in enumerate(record_values):
+                    if value:
+                        index[value].append(idx)
+            indexes[field] = {value: np.unique(rows) for value, rows in index.items()}
+        
+        logger.info(f"Built exact-match index for {source_name} with "
+                    f"{sum(len(index) for index in indexes.values())} values")
+        return indexes
+    
+    def _get_exact_rows(self, query: Dict[str, str], df: pd.DataFrame,
+                        source_name: str) -> Dict[str, np.ndarray]:
+        """
+        Look up the rows of a source whose identifying fields equal the query's.
+        
+        Args:
+            query (Dict[str, str]): Search query
+            df (pd.DataFrame): Source records
+            source_name (str): Name of the source
+            
+        Returns:
+            Dict[str, np.ndarray]: Field -> row indices with an exact match
+        """
+        query_values = {field: self._normalize_values(field, [query[field]])[0]
+                        for field in self.EXACT_INDEX_FIELDS if query.get(field)}
+        if not any(query_values.values()):
+            return {}
+        
+        # Reuse the index while the same DataFrame is being searched
+        cached = self._exact_indexes.get(source_name)
+        if cached is None or cached[0] is not df:
+            cached = (df, self._build_exact_index(self._get_prepared_source(source_name, df), source_name))
+            self._exact_indexes[source_name] = cached
+        indexes = cached[1]
+        
+        return {field: indexes[field][value] for field, value in query_values.items()
+                if value in indexes[field]}
     
-    def _meets_minimum_requirements(self, field_scores: Dict[str, float], query: Dict[str, str]) -> bool:
+    def _is_strong_match(self, field_scores: Dict[str, np.ndarray], num_records: int) -> np.ndarray:
         """
-        Check if a match meets minimum requirements for acceptance.
+        Determine which records are strong matches based on field scores with strict criteria.
         
         Args:
-            field_scores (Dict[str, float]): Individual field scores
+            field_scores (Dict[str, np.ndarray]): Individual field scores per record
+                (0.0 where a field did not match)
+            num_records (int): Number of records scored
+            
+        Returns:
+            np.ndarray: True for the records whose match is considered strong
+        """
+        no_scores = np.zeros(num_records)
+        
+        # Perfect ID match always qualifies as strong
+        strong = field_scores.get('national_id', no_scores) == 100.0
+        
+        # Pairs of fields that both score very high, e.g. name and date, or an email
+        # combined with at least one other good field
+        for (first_field, first_score), (second_field, second_score) in self.STRONG_MATCH_PAIRS:
+            strong |= (field_scores.get(first_field, no_scores) >= first_score) & \
+                (field_scores.get(second_field, no_scores) >= second_score)
+        
+        # Multiple good fields, e.g. at least 3 fields with high scores OR 2 fields with
+        # very high scores
+        score_matrix = np.vstack([no_scores, *field_scores.values()])
+        for min_fields, min_score in self.STRONG_MATCH_FIELD_COUNTS:
+            strong |= (score_matrix >= min_score).sum(axis=0) >= min_fields
+        
+        return strong
+    
+    def _meets_minimum_requirements(self, field_scores: Dict[str, np.ndarray], query: Dict[str, str],
+                                    num_records: int) -> np.ndarray:
+        """
+        Check which records meet the minimum requirements for acceptance.
+        
+        Args:
+            field_scores (Dict[str, np.ndarray]): Individual field scores per record
+                (0.0 where a field did not match)
             query (Dict[str, str]): Original query to check what fields were provided
+            num_records (int): Number of records scored
             
         Returns:
-            bool: True if the match meets minimum requirements
+            np.ndarray: True for the records whose match meets minimum requirements
         """
+        no_scores = np.zeros(num_records)
+        score_matrix = np.vstack([no_scores, *field_scores.values()])
+        
         # Must have at least one high-confidence field
-        max_score = max(field_scores.values()) if field_scores else 0
-        if max_score < self.MIN_SCORES['weak_match']:
-            return False
+        meets = score_matrix.max(axis=0) >= self.MIN_SCORES['weak_match']
         
         # Check if we have at least one of the required fields with good score
-        has_required_field = False
+        has_required_field = np.zeros(num_records, dtype=bool)
         for field in self.REQUIRED_MATCH_FIELDS['must_have_one']:
-            if field in field_scores and field_scores[field] >= self.FUZZY_THRESHOLDS[field]:
-                has_required_field = True
-                break
+            if field in field_scores:
+                has_required_field |= field_scores[field] >= self.FUZZY_THRESHOLDS[field]
+        meets &= has_required_field
         
-        if not has_required_field:
-            return False
+        # Additional validation: reject matches with more than 50% of the scored fields low
+        scored = score_matrix > 0
+        low_score_count = (scored & (score_matrix < 50.0)).sum(axis=0)
+        not_mostly_low = low_score_count * 2 <= scored.sum(axis=0)
         
         # If query has both name and dob, match should have reasonable scores for both
         if query.get('full_name') and query.get('dob'):
-            name_score = field_scores.get('full_name', 0)
-            dob_score = field_scores.get('dob', 0)
-            
-            # If we have a perfect date match, be more lenient with name
-            if dob_score >= 100.0 and name_score >= 60.0:
-                return True
+            name_score = field_scores.get('full_name', no_scores)
+            dob_score = field_scores.get('dob', no_scores)
             
-            # If we have a very good name match, be more lenient with date
-            if name_score >= 90.0 and dob_score >= 60.0:
-                return True
+            # If we have a perfect date match, be more lenient with name, and
+            # if we have a very good name match, be more lenient with date
+            lenient = ((dob_score >= 100.0) & (name_score >= 60.0)) | \
+                ((name_score >= 90.0) & (dob_score >= 60.0))
             
             # Both should be at least moderately good for normal cases
-            if name_score < 65.0 or dob_score < 65.0:
-                return False
+            moderate = (name_score >= 65.0) & (dob_score >= 65.0)
+            
+            return meets & (lenient | (moderate & not_mostly_low))
         
-        # Additional validation: reject matches with too many low scores
-        low_score_count = sum(1 for score in field_scores.values() if score < 50.0)
-        total_scores = len(field_scores)
+        return meets & not_mostly_low
+    
+    def _read_processed_file(self, file_path: Path) -> pd.DataFrame:
+        """
+        Read a processed CSV file, through a Parquet copy when pyarrow is installed.
         
-        # Reject if more than 50% of fields have low scores
-        if total_scores > 0 and low_score_count / total_scores > 0.5:
-            return False
+        The Parquet copy is written on the first read and reused while it is at least
+        as recent as the CSV, so later runs skip CSV parsing. It holds the frame exactly
+        as pd.read_csv returns it.
+        
+        Args:
+            file_path (Path): Processed CSV file
+            
+        Returns:
+            pd.DataFrame: Source records
+        """
+        if not PYARROW_AVAILABLE:
+            return pd.read_csv(file_path)
+        
+        cache_dir = file_path.parent / PARQUET_CACHE_DIR
+        cache_file = cache_dir / f"{file_path.stem}.v{PARQUET_CACHE_VERSION}.parquet"
+        if cache_file.exists() and cache_file.stat().st_mtime_ns >= file_path.stat().st_mtime_ns:
+            try:
+                df = pd.read_parquet(cache_file)
+                
+                # Missing strings come back as None; read_csv gives NaN
+                object_columns = df.columns[df.dtypes == object]
+                if len(object_columns):
+                    df[object_columns] = df[object_columns].where(df[object_columns].notna(), np.nan)
+                return df
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable Parquet cache {cache_file}: {str(e)}")
+        
+        # Parse with the default engine: pyarrow's reader would turn ISO date columns into
+        # datetime.date objects and missing strings into None
+        df = pd.read_csv(file_path)
+        
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_file, compression='zstd')
+            
+            # Drop the unversioned copy written by earlier releases
+            (cache_dir / f"{file_path.stem}.parquet").unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not write Parquet cache {cache_file}: {str(e)}")
         
-        return True
+        return df
     
     def load_processed_data(self) -> Dict[str, pd.DataFrame]:
         """
@@ -939,16 +1597,25 @@ class ProfileMatchingAgent:
         Returns:
             Dict[str, pd.DataFrame]: Dictionary mapping source names to DataFrames
         """
+        data_dir = Path(self.processed_data_dir)
+        csv_files = list(data_dir.glob("*.csv"))
+        
+        # Reuse the loaded data while no source file was added, removed or modified
+        signature = sorted((str(file_path), file_path.stat().st_mtime_ns, file_path.stat().st_size)
+                           for file_path in csv_files)
+        if self._data_cache is not None and signature == self._data_signature:
+            logger.info(f"Processed data unchanged, reusing {len(self._data_cache)} loaded sources")
+            return dict(self._data_cache)
+        
         logger.info(f"Loading processed data from: {self.processed_data_dir}")
         
         data = {}
-        data_dir = Path(self.processed_data_dir)
         
         # Look for CSV files in processed_data directory  
-        for file_path in data_dir.glob("*.csv"):
+        for file_path in csv_files:
             source_name = file_path.stem
             try:
-                df = pd.read_csv(file_path)
+                df = self._read_processed_file(file_path)
                 logger.info(f"Found file {file_path} with columns: {list(df.columns)}")
                 
                 # Clean up duplicate column names by keeping only the first occurrence
@@ -970,6 +1637,9 @@ class ProfileMatchingAgent:
                 data[source_name] = df
                 logger.info(f"Successfully loaded {len(df)} records from {source_name}")
                 
+                # Normalize the matchable columns once, not on every comparison
+                self._get_prepared_source(source_name, df)
+                
                 # Log a sample record for debugging
                 if len(df) > 0:
                     sample_record = df.iloc[0].fillna('').to_dict()
@@ -983,7 +1653,10 @@ class ProfileMatchingAgent:
         else:
             logger.info(f"Successfully loaded data from {len(data)} sources: {list(data.keys())}")
         
-        return data
+        self._data_cache = data
+        self._data_signature = signature
+        
+        return dict(data)
     
     def find_matches(self, query: Dict[str, str], 
                     data: Dict[str, pd.DataFrame],
@@ -1002,92 +1675,154 @@ class ProfileMatchingAgent:
         logger.info("Searching for matching profiles...")
         matches = {}
         
-        for source_name, df in data.items():
-            source_matches = []
-            
-            # Convert DataFrame to list of dictionaries for easier processing
-            # Replace NaN values with None for JSON serialization
-            df_clean = df.fillna('')  # Replace NaN with empty string
-            records = df_clean.to_dict('records')
-            
-            for record in records:
-                match_score, field_scores = self._calculate_match_score(query, record, source_name)
-                
-                # Log the scores for debugging
-                logger.debug(f"Record in {source_name}:")
-                logger.debug(f"  Record: {record}")
-                logger.debug(f"  Match score: {match_score}")
-                logger.debug(f"  Field scores: {field_scores}")
-                
-                # Check if this is a strong match based on field scores
-                is_strong_match = self._is_strong_match(field_scores)
-                
-                # Check if the match meets minimum requirements
-                meets_requirements = self._meets_minimum_requirements(field_scores, query)
-                
-                # Much stricter acceptance criteria:
-                # 1. Strong match (very high field scores) - always accept
-                # 2. Perfect ID match - always accept
-                # 3. High overall score AND meets minimum requirements
-                # 4. Good score with at least 2 high-confidence fields
-                accept_match = False
-                
-                if is_strong_match:
-                    accept_match = True
-                    logger.info(f"Accepting strong match in {source_name} with score {match_score}")
-                elif 'national_id' in field_scores and field_scores['national_id'] == 100.0:
-                    accept_match = True
-                    logger.info(f"Accepting perfect ID match in {source_name} with score {match_score}")
-                elif match_score >= self.MIN_SCORES['good_match'] and meets_requirements:
-                    # Additional check: must have at least 2 fields with high confidence
-                    high_confidence_fields = sum(1 for score in field_scores.values() 
-                                                if score >= self.MIN_SCORES['good_match'])
-                    if high_confidence_fields >= 2:
-                        accept_match = True
-                        logger.info(f"Accepting good match in {source_name} with score {match_score} and {high_confidence_fields} high-confidence fields")
-                
-                if accept_match:
-                    record['match_score'] = match_score
-                    record['field_scores'] = field_scores
-                    record['is_strong_match'] = is_strong_match
-                    record['meets_requirements'] = meets_requirements
-                    source_matches.append(record)
-                else:
-                    logger.debug(f"Rejecting match in {source_name} with score {match_score} - does not meet strict criteria")
-            
+        # Sources are independent, score them in parallel (rapidfuzz releases the GIL)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_source = {
+                source_name: executor.submit(self._find_source_matches, query, source_name, df)
+                for source_name, df in data.items()
+            }
+        
+        for source_name, future in future_to_source.items():
+            source_matches = future.result()
             if source_matches:
-                # Sort matches by multiple criteria for best quality
-                source_matches.sort(key=lambda x: (
-                    x['is_strong_match'],           # Strong matches first
-                    x['match_score'],               # Then by match score
-                    x.get('meets_requirements', False)  # Then by meeting requirements
-                ), reverse=True)
-                
-                # Limit results per source to prevent overwhelming results
-                # Only keep top 3 matches per source unless there are strong matches
-                strong_matches = [m for m in source_matches if m['is_strong_match']]
-                if len(strong_matches) > 0:
-                    # Keep all strong matches plus top 2 others
-                    max_results = len(strong_matches) + 2
-                else:
-                    # Keep only top 3 results if no strong matches
-                    max_results = 3
-                
-                # Apply the limit
-                source_matches = source_matches[:max_results]
-                
                 matches[source_name] = source_matches
-                logger.info(f"Found {len(source_matches)} high-quality matches in {source_name} "
-                           f"({len(strong_matches)} strong matches)")
-                
-                # Log details of top matches for debugging
-                for i, match in enumerate(source_matches[:2]):
-                    logger.info(f"  Top match {i+1}: score={match['match_score']:.1f}, "
-                               f"strong={match['is_strong_match']}, "
-                               f"fields={list(match['field_scores'].keys())}")
         
         return matches
     
+    def find_matches_batch(self, queries: List[Dict[str, str]],
+                           data: Optional[Dict[str, pd.DataFrame]] = None) -> List[Dict[str, List[Dict]]]:
+        """
+        Find matching records across all data sources for many queries at once.
+        
+        The processed data is loaded once, and the normalized columns, blocking and exact
+        indexes built for the first query are reused by all the others.
+        
+        Args:
+            queries (List[Dict[str, str]]): Search queries with anchor attributes
+            data (Optional[Dict[str, pd.DataFrame]]): Source DataFrames, loaded from the
+                processed data directory if not given
+            
+        Returns:
+            List[Dict[str, List[Dict]]]: Matches of each query, in query order
+        """
+        if data is None:
+            data = self.load_processed_data()
+        
+        logger.info(f"Searching for matching profiles of {len(queries)} queries...")
+        return [self.find_matches(query, data) for query in queries]
+    
+    def _find_source_matches(self, query: Dict[str, str], source_name: str,
+                             df: pd.DataFrame) -> List[Dict]:
+        """
+        Find matching records in a single data source.
+        
+        Args:
+            query (Dict[str, str]): Search query with anchor attributes
+            source_name (str): Name of the source
+            df (pd.DataFrame): Source records
+        
+        Returns:
+            List[Dict]: Accepted matching records, best first
+        """
+        prepared = self._get_prepared_source(source_name, df)
+        num_records = len(df)
+        
+        # Only score the records sharing a blocking key with the query
+        candidate_rows = self._get_candidate_rows(query, df, source_name)
+        if candidate_rows is not None:
+            logger.debug(f"Blocking kept {len(candidate_rows)}/{len(df)} records in {source_name}")
+            prepared = {field: [record_values[candidate_rows] for record_values in field_columns]
+                        for field, field_columns in prepared.items()}
+            num_records = len(candidate_rows)
+        
+        # Exact ID/email hits are found by hash lookup instead of fuzzy scoring
+        exact_rows = {}
+        for field, rows in self._get_exact_rows(query, df, source_name).items():
+            exact_mask = np.zeros(len(df), dtype=bool)
+            exact_mask[rows] = True
+            exact_rows[field] = exact_mask if candidate_rows is None else exact_mask[candidate_rows]
+        
+        match_scores, field_score_columns = self._score_source(query, prepared, num_records,
+                                                               exact_rows, prune=True)
+        
+        # Evaluate the acceptance rules for every record at once
+        is_strong_match = self._is_strong_match(field_score_columns, num_records)
+        meets_requirements = self._meets_minimum_requirements(field_score_columns, query, num_records)
+        
+        # Much stricter acceptance criteria:
+        # 1. Strong match (very high field scores) - always accept
+        # 2. Perfect ID match - always accept
+        # 3. High overall score AND meets minimum requirements
+        # 4. Good score with at least 2 high-confidence fields
+        perfect_id = field_score_columns['national_id'] == 100.0 \
+            if 'national_id' in field_score_columns else np.zeros(num_records, dtype=bool)
+        high_confidence_fields = np.zeros(num_records, dtype=np.int64)
+        for scores in field_score_columns.values():
+            high_confidence_fields += scores >= self.MIN_SCORES['good_match']
+        good_match = (match_scores >= self.MIN_SCORES['good_match']) & meets_requirements & \
+            (high_confidence_fields >= self.GOOD_MATCH_MIN_FIELDS)
+        
+        accepted = np.flatnonzero(is_strong_match | perfect_id | good_match)
+        
+        for idx in accepted:
+            if is_strong_match[idx]:
+                logger.info(f"Accepting strong match in {source_name} with score {match_scores[idx]}")
+            elif perfect_id[idx]:
+                logger.info(f"Accepting perfect ID match in {source_name} with score {match_scores[idx]}")
+            else:
+                logger.info(f"Accepting good match in {source_name} with score {match_scores[idx]} and {high_confidence_fields[idx]} high-confidence fields")
+        
+        if not len(accepted):
+            return []
+        
+        # Sort matches by multiple criteria for best quality: strong matches first,
+        # then by match score, then by meeting requirements (stable, so ties keep row order)
+        accepted = accepted[np.lexsort((~meets_requirements[accepted],
+                                        -match_scores[accepted],
+                                        ~is_strong_match[accepted]))]
+        
+        # Limit results per source to prevent overwhelming results
+        # Only keep top 3 matches per source unless there are strong matches
+        strong_count = int(is_strong_match[accepted].sum())
+        if strong_count > 0:
+            # Keep all strong matches plus top 2 others
+            max_results = strong_count + 2
+        else:
+            # Keep only top 3 results if no strong matches
+            max_results = 3
+        accepted = accepted[:max_results]
+        
+        # Only materialize the kept records as dictionaries,
+        # replacing NaN values with empty strings for JSON serialization
+        rows = accepted if candidate_rows is None else candidate_rows[accepted]
+        source_matches = df.iloc[rows].fillna('').to_dict('records')
+        for record, idx in zip(source_matches, accepted):
+            field_scores = {field: float(scores[idx])
+                            for field, scores in field_score_columns.items() if scores[idx] > 0}
+            
+            # Log the scores for debugging
+            logger.debug(f"Record {idx} in {source_name}:")
+            logger.debug(f"  Match score: {match_scores[idx]}")
+            logger.debug(f"  Field scores: {field_scores}")
+            
+            record.update({
+                'match_score': float(match_scores[idx]),
+                'field_scores': field_scores,
+                'is_strong_match': bool(is_strong_match[idx]),
+                'meets_requirements': bool(meets_requirements[idx])
+            })
+        
+        logger.info(f"Found {len(source_matches)} high-quality matches in {source_name} "
+                   f"({strong_count} strong matches)")
+        
+        # Log details of top matches for debugging
+        for i, match in enumerate(source_matches[:2]):
+            logger.info(f"  Top match {i+1}: score={match['match_score']:.1f}, "
+                       f"strong={match['is_strong_match']}, "
+                       f"fields={list(match['field_scores'].keys())}")
+        
+        return source_matches
+    
     def merge_matches(self, matches: Dict[str, List[Dict]]) -> Dict:
         """
         Merge matching records into a single enriched profile.
@@ -1137,36 +1872,189 @@ class ProfileMatchingAgent:
         
         return merged_profile
     
-    def save_profile(self, profile: Dict, query: Dict[str, str]):
+    def _serialize_profile(self, profile: Dict, pretty: Optional[bool] = None) -> bytes:
+        """
+        Serialize a profile to UTF-8 JSON, with orjson when it is installed.
+        
+        Args:
+            profile (Dict): Profile to serialize
+            pretty (Optional[bool]): Indent the output; defaults to pretty_profiles
+            
+        Returns:
+            bytes: JSON document
+        """
+        if pretty is None:
+            pretty = self.pretty_profiles
+        
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(profile, option=option)
+            except TypeError as e:
+                logger.debug(f"orjson could not serialize profile, using json: {str(e)}")
+        
+        if pretty:
+            profile_json = json.dumps(profile, indent=2, ensure_ascii=False)
+        else:
+            profile_json = json.dumps(profile, separators=(',', ':'), ensure_ascii=False)
+        return profile_json.encode('utf-8')
+    
+    def _profile_hash(self, profile: Dict) -> bytes:
+        """
+        Hash the content of a profile, ignoring volatile fields such as timestamps.
+        
+        Args:
+            profile (Dict): Profile to hash
+            
+        Returns:
+            bytes: 16-byte BLAKE2b digest
+        """
+        stable_profile = {key: value for key, value in profile.items()
+                          if key not in VOLATILE_PROFILE_FIELDS}
+        return hashlib.blake2b(self._serialize_profile(stable_profile, pretty=False), digest_size=16).digest()
+    
+    def _compress_profile(self, file_path: Path, profile_json: bytes) -> bytes:
+        """
+        Compress serialized profile JSON according to the file suffix.
+        
+        Args:
+            file_path (Path): Profile file path (.json, .json.gz or .json.zst)
+            profile_json (bytes): Serialized profile
+            
+        Returns:
+            bytes: File contents to write
+        """
+        if file_path.suffix == '.zst':
+            return zstandard.ZstdCompressor(level=PROFILE_COMPRESSION_LEVEL).compress(profile_json)
+        if file_path.suffix == '.gz':
+            return gzip.compress(profile_json, compresslevel=PROFILE_COMPRESSION_LEVEL)
+        return profile_json
+    
+    def load_profile(self, file_path: Union[str, Path]) -> Dict:
+        """
+        Load a saved profile, decompressing it based on the file suffix.
+        
+        Args:
+            file_path (Union[str, Path]): Profile file path (.json, .json.gz or .json.zst)
+            
+        Returns:
+            Dict: Saved profile
+        """
+        file_path = Path(file_path)
+        contents = file_path.read_bytes()
+        
+        if file_path.suffix == '.zst':
+            if not ZSTD_AVAILABLE:
+                logger.error(f"Cannot load {file_path}: zstandard is not installed. Install with: pip install zstandard")
+                raise ImportError("Missing zstandard dependency")
+            contents = zstandard.ZstdDecompressor().decompress(contents)
+        elif file_path.suffix == '.gz':
+            contents = gzip.decompress(contents)
+        
+        return orjson.loads(contents) if ORJSON_AVAILABLE else json.loads(contents)
+    
+    def save_profile(self, profile: Dict, query: Dict[str, str]) -> Optional[Path]:
         """
         Save the merged profile to a JSON file.
         
+        The file is written before returning.
+        
         Args:
             profile (Dict): Merged profile to save
             query (Dict[str, str]): Original search query
+            
+        Returns:
+            Optional[Path]: Profile file path, or None if there was no profile to save
+                or writing it failed
         """
         if not profile:
             logger.warning("No profile to save")
-            return
+            return None
         
         # Create filename based on query attributes
-        filename_parts = []
         if 'national_id' in query:
-            filename_parts.append(query['national_id'])
+            profile_key = query['national_id']
         elif 'full_name' in query:
-            filename_parts.append(query['full_name'].replace(' ', '_'))
+            profile_key = query['full_name'].translate(FILENAME_TRANSLATION)
         else:
-            filename_parts.append('unknown')
+            profile_key = 'unknown'
+        
+        file_path = self._profiles_dir_path / f"profile_{profile_key}{self._profile_suffix}"
+        
+        with self._write_lock:
+            written = self._write_profile(file_path, profile)
+        return file_path if written else None
+    
+    def save_profile_append(self, profile: Dict, query: Dict[str, str],
+                            jsonl_path: Optional[str] = None):
+        """
+        Append the merged profile as one line to a JSON Lines file.
         
-        filename = f"profile_{'_'.join(filename_parts)}.json"
-        file_path = Path(self.profiles_dir) / filename
+        Meant for bulk screening runs: each save is a single append instead of a
+        rewrite, and readers split the file on newlines.
         
+        Args:
+            profile (Dict): Merged profile to save
+            query (Dict[str, str]): Original search query
+            jsonl_path (Optional[str]): File to append to, defaults to profiles.jsonl
+                in the profiles directory
+        """
+        if not profile:
+            logger.warning("No profile to save")
+            return
+        
+        file_path = Path(jsonl_path) if jsonl_path else self._profiles_dir_path / PROFILES_JSONL_FILE
+        
+        try:
+            line = self._serialize_profile({'query': query, 'profile': profile}, pretty=False) + b'\n'
+            with open(file_path, 'ab', buffering=PROFILE_WRITE_BUFFER_SIZE) as f:
+                f.write(line)
+            logger.info(f"Appended profile to: {file_path}")
+        except Exception as e:
+            logger.error(f"Failed to append profile: {str(e)}")
+    
+    def _write_profile(self, file_path: Path, profile: Dict) -> bool:
+        """
+        Write a profile to its JSON file, skipping the write if it is unchanged.
+        
+        Args:
+            file_path (Path): Profile file path
+            profile (Dict): Profile to write
+            
+        Returns:
+            bool: True if the file holds the profile, False if writing failed
+        """
+        # Skip rewriting a file with the same profile (e.g. a rerun query), unless
+        # the file was removed since it was written
         try:
-            with open(file_path, 'w') as f:
-                json.dump(profile, f, indent=2)
+            profile_hash = self._profile_hash(profile)
+        except Exception as e:
+            logger.error(f"Failed to save profile: {str(e)}")
+            return False
+        if self._profile_hashes.get(file_path) == profile_hash and file_path.exists():
+            logger.debug(f"Profile unchanged, skipping write: {file_path}")
+            return True
+        
+        # Write to a temporary file and rename it over the profile, so readers
+        # never see a partially written file
+        tmp_path = file_path.with_name(file_path.name + '.tmp')
+        try:
+            # Serialize up front so the profile is written in one call rather than
+            # in the many small chunks json.dump streams
+            profile_json = self._serialize_profile(profile)
+            with open(tmp_path, 'wb', buffering=PROFILE_WRITE_BUFFER_SIZE) as f:
+                f.write(self._compress_profile(file_path, profile_json))
+            os.replace(tmp_path, file_path)
+            self._profile_hashes[file_path] = profile_hash
             logger.info(f"Saved profile to: {file_path}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save profile: {str(e)}")
+            self._profile_hashes.pop(file_path, None)
+            tmp_path.unlink(missing_ok=True)
+            return False
     
     def find_and_return_all_matches(self, query: Dict[str, str]) -> Optional[Dict]:
         """
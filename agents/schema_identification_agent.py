@@ -14,7 +14,9 @@ import json
 import pandas as pd
 import logging
 import re
-from typing import Dict, List, Optional, Tuple, Any
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple, Any, Iterator
 from datetime import datetime
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -22,6 +24,38 @@ from functools import lru_cache
 import hashlib
 from tqdm import tqdm
 
+# Import dependencies
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+    openpyxl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pa_csv = None
+    pa_parquet = None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    hyperscan = None
+
 # Import our utility modules
 from utils.llm_service import LLMSchemaMapper
 
@@ -30,10 +64,17 @@ DATA_SOURCES_DIR = "data_sources"
 PROCESSED_DATA_DIR = "processed_data"
 SCHEMA_MAPPINGS_DIR = "schema_mappings"
 UNIFIED_SCHEMA_FILE = "unified_schema.json"
-UNMAPPED_FIELDS_FILE = "unmapped_fields.json"
+UNMAPPED_FIELDS_FILE = "unmapped_fields.jsonl"  # One JSON entry per line, appended as fields go unmapped
+LEGACY_UNMAPPED_FIELDS_FILE = "unmapped_fields.json"  # Former single-array format, migrated on load
 SUPPORTED_FILE_TYPES = [".csv", ".xlsx", ".json"]
+OUTPUT_FORMATS = ["csv", "parquet"]  # Processed data file formats
+OUTPUT_FORMAT = "csv"  # Default processed data format (the profile matching agent reads CSV)
 BATCH_SIZE = 1000  # Number of records to process at once
 MAX_WORKERS = 4    # Number of parallel workers
+LLM_BATCH_SIZE = 20  # Number of unstructured texts sent per LLM extraction prompt
+LLM_TOKENS_PER_TEXT = 256  # Output token budget per text in a batched extraction prompt
+FIELD_MAPPING_DB = "mappings.db"  # Persistent per-field LLM mapping and prompt response cache (in schema mappings dir)
+FIELD_MAPPING_CACHE_SIZE = 10000  # In-process per-field mapping cache entries
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -45,13 +86,24 @@ class EnhancedSchemaIdentificationAgent:
     data sources, with dynamic schema evolution capabilities.
     """
     
+    # Regex patterns for common fields in unstructured text, one capture group each
+    EXTRACTION_PATTERNS = {
+        'email': re.compile(r'(\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)', re.IGNORECASE),
+        # Anchored on word boundaries so digits embedded in IDs or codes are not scanned as phones
+        'phone': re.compile(r'(\+?\b[1-9]\d{7,14}\b)', re.IGNORECASE),
+        'national_id': re.compile(r'(\b[A-Z]{2,3}[0-9]{3,10}\b)', re.IGNORECASE),
+        'dob': re.compile(r'(\b(?:19|20)\d{2}[-/](?:0[1-9]|1[0-2])[-/](?:0[1-9]|[12]\d|3[01])\b)', re.IGNORECASE)
+    }
+    
     def __init__(self, 
                  data_sources_dir: str = DATA_SOURCES_DIR,
                  processed_data_dir: str = PROCESSED_DATA_DIR,
                  schema_mappings_dir: str = SCHEMA_MAPPINGS_DIR,
                  auto_extend_schema: bool = True,
                  max_workers: int = MAX_WORKERS,
-                 batch_size: int = BATCH_SIZE):
+                 batch_size: int = BATCH_SIZE,
+                 llm_batch_size: int = LLM_BATCH_SIZE,
+                 output_format: str = OUTPUT_FORMAT):
         """
         Initialize the Enhanced Schema Identification Agent.
         
@@ -62,6 +114,8 @@ class EnhancedSchemaIdentificationAgent:
             auto_extend_schema (bool): Whether to automatically extend unified schema
             max_workers (int): Maximum number of parallel workers
             batch_size (int): Number of records to process at once
+            llm_batch_size (int): Number of unstructured texts sent per LLM extraction prompt
+            output_format (str): Processed data format, 'csv' or 'parquet' (zstd, requires pyarrow)
         """
         self.data_sources_dir = data_sources_dir
         self.processed_data_dir = processed_data_dir
@@ -69,8 +123,23 @@ class EnhancedSchemaIdentificationAgent:
         self.auto_extend_schema = auto_extend_schema
         self.max_workers = max_workers
         self.batch_size = batch_size
+        self.llm_batch_size = llm_batch_size
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if output_format == 'parquet' and not PYARROW_AVAILABLE:
+            logger.warning("pyarrow not installed, saving processed data as CSV")
+            output_format = 'csv'
+        self.output_format = output_format
+        self._parquet_writers = {}
         self.llm_mapper = LLMSchemaMapper()
         
+        # Guards the unified schema and unmapped fields log when sources are processed in parallel
+        self._schema_lock = threading.Lock()
+        
+        # Single-pass scanner for the extraction patterns; scratch space is per thread
+        self._hs_db = self._build_hyperscan_database()
+        self._hs_local = threading.local()
+        
         # Ensure directories exist
         self._ensure_directories()
         
@@ -97,8 +166,25 @@ class EnhancedSchemaIdentificationAgent:
         logger.info(f"Batch size: {self.batch_size}")
     
     def _init_cache(self):
-        """Initialize LRU cache for schema mappings."""
+        """Initialize LRU caches for schema mappings and the persistent per-field mapping cache."""
         self._get_cached_mapping = lru_cache(maxsize=100)(self._get_cached_mapping)
+        self._cached_field_mapping = lru_cache(maxsize=FIELD_MAPPING_CACHE_SIZE)(self._cached_field_mapping)
+        
+        self._mapping_db_lock = threading.Lock()
+        self._mapping_db = None
+        try:
+            self._mapping_db = sqlite3.connect(Path(self.schema_mappings_dir) / FIELD_MAPPING_DB,
+                                               check_same_thread=False)
+            self._mapping_db.execute(
+                "CREATE TABLE IF NOT EXISTS mappings(key TEXT PRIMARY KEY, unified TEXT, confidence REAL)"
+            )
+            self._mapping_db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses(key TEXT PRIMARY KEY, response TEXT)"
+            )
+            self._mapping_db.commit()
+        except Exception as e:
+            logger.warning(f"Persistent field mapping cache unavailable: {str(e)}")
+            self._mapping_db = None
     
     def _load_unified_schema(self) -> Dict[str, str]:
         """
@@ -155,31 +241,49 @@ class EnhancedSchemaIdentificationAgent:
     def _load_unmapped_fields(self) -> List[Dict]:
         """
         Load unmapped fields log from disk or create empty if not exists.
+        A log in the legacy JSON array format is migrated to JSON lines.
         
         Returns:
             List[Dict]: List of unmapped field entries
         """
         unmapped_file = Path(UNMAPPED_FIELDS_FILE)
+        legacy_file = Path(LEGACY_UNMAPPED_FIELDS_FILE)
         
         if unmapped_file.exists():
             try:
                 with open(unmapped_file, 'r') as f:
-                    unmapped = json.load(f)
+                    unmapped = [json.loads(line) for line in f if line.strip()]
                 logger.info(f"Loaded {len(unmapped)} unmapped field entries")
                 return unmapped
             except Exception as e:
                 logger.error(f"Error loading unmapped fields: {str(e)}")
+        elif legacy_file.exists():
+            try:
+                with open(legacy_file, 'r') as f:
+                    unmapped = json.load(f)
+                with open(unmapped_file, 'w') as f:
+                    f.writelines(json.dumps(entry) + '\n' for entry in unmapped)
+                logger.info(f"Migrated {len(unmapped)} unmapped field entries to {UNMAPPED_FIELDS_FILE}")
+                return unmapped
+            except Exception as e:
+                logger.error(f"Error migrating unmapped fields: {str(e)}")
         
         return []
     
-    def _save_unmapped_fields(self):
-        """Save unmapped fields log to disk."""
-        try:
-            with open(UNMAPPED_FIELDS_FILE, 'w') as f:
-                json.dump(self.unmapped_fields, f, indent=2)
-            logger.info(f"Saved {len(self.unmapped_fields)} unmapped field entries")
-        except Exception as e:
-            logger.error(f"Error saving unmapped fields: {str(e)}")
+    def _append_unmapped(self, entry: Dict):
+        """
+        Record an unmapped field and append it to the log on disk.
+        
+        Args:
+            entry (Dict): Unmapped field entry
+        """
+        with self._schema_lock:
+            self.unmapped_fields.append(entry)
+            try:
+                with open(UNMAPPED_FIELDS_FILE, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+            except Exception as e:
+                logger.error(f"Error saving unmapped field: {str(e)}")
     
     def detect_if_unstructured(self, df: pd.DataFrame) -> bool:
         """
@@ -197,14 +301,12 @@ class EnhancedSchemaIdentificationAgent:
         
         # Check if most columns contain text data that looks like free-form text
         text_columns = 0
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                # Sample some values to check if they look like free-form text
-                sample_values = df[col].dropna().head(10)
-                for value in sample_values:
-                    if isinstance(value, str) and len(value.split()) > 5:  # More than 5 words
-                        text_columns += 1
-                        break
+        for col in df.select_dtypes(include='object').columns:
+            # Sample some values to check if they look like free-form text
+            sample_values = df[col].dropna().head(10)
+            sample_values = sample_values[sample_values.map(type) == str]
+            if (sample_values.str.split().str.len() > 5).any():  # More than 5 words
+                text_columns += 1
         
         # If most columns are text-heavy, consider it unstructured
         structured_threshold = max(2, len(df.columns) * 0.7)
@@ -228,17 +330,7 @@ class EnhancedSchemaIdentificationAgent:
         extracted = {}
         
         # First try regex patterns for common fields
-        patterns = {
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'phone': r'[\+]?[1-9]?[0-9]{7,15}',
-            'national_id': r'\b[A-Z]{2,3}[0-9]{3,10}\b',
-            'dob': r'\b(19|20)\d{2}[-/](0[1-9]|1[0-2])[-/](0[1-9]|[12]\d|3[01])\b'
-        }
-        
-        for field, pattern in patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                extracted[field] = matches[0] if isinstance(matches[0], str) else matches[0][0]
+        extracted.update(self._scan_fields(text))
         
         # Use LLM for more sophisticated extraction
         try:
@@ -249,6 +341,83 @@ class EnhancedSchemaIdentificationAgent:
         
         return extracted
     
+    def _build_hyperscan_database(self):
+        """
+        Compile all extraction patterns into one Hyperscan database.
+        
+        Returns:
+            Optional[hyperscan.Database]: Compiled database, or None if Hyperscan is unavailable
+        """
+        if not HYPERSCAN_AVAILABLE:
+            return None
+        
+        try:
+            expressions = [pattern.pattern.encode() for pattern in self.EXTRACTION_PATTERNS.values()]
+            database = hyperscan.Database()
+            # Report the leftmost start of each match so spans can mirror re.search
+            database.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+            )
+            logger.info("Compiled extraction patterns into a Hyperscan database")
+            return database
+        except Exception as e:
+            logger.warning(f"Hyperscan compilation failed, using re: {str(e)}")
+            return None
+    
+    def _search_fields(self, text: str) -> Dict[str, str]:
+        """
+        Extract the first match of every extraction pattern with re.
+        
+        Args:
+            text (str): Text to search
+            
+        Returns:
+            Dict[str, str]: Matched field values
+        """
+        extracted = {}
+        for field, pattern in self.EXTRACTION_PATTERNS.items():
+            match = pattern.search(text)
+            if match:
+                extracted[field] = match.group(1)
+        return extracted
+    
+    def _scan_fields(self, text: str) -> Dict[str, str]:
+        """
+        Extract the first match of every extraction pattern with one Hyperscan pass.
+        Falls back to re without Hyperscan, and for non-ASCII text, where re's Unicode
+        word boundaries and case folding differ from Hyperscan's byte semantics.
+        
+        Args:
+            text (str): Text to scan
+            
+        Returns:
+            Dict[str, str]: Matched field values
+        """
+        if self._hs_db is None or not text.isascii():
+            return self._search_fields(text)
+        
+        scratch = getattr(self._hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+        
+        data = text.encode('ascii')
+        spans = {}
+        
+        def on_match(pattern_id, start, end, flags, context):
+            # re.search picks the leftmost start, then the longest (greedy) match from it
+            span = spans.get(pattern_id)
+            if span is None or start < span[0] or (start == span[0] and end > span[1]):
+                spans[pattern_id] = (start, end)
+        
+        self._hs_db.scan(data, match_event_handler=on_match, scratch=scratch)
+        
+        fields = list(self.EXTRACTION_PATTERNS)
+        return {fields[pattern_id]: data[start:end].decode('ascii')
+                for pattern_id, (start, end) in sorted(spans.items())}
+    
     def _extract_with_llm(self, text: str) -> Dict[str, str]:
         """
         Use LLM to extract structured fields from unstructured text.
@@ -279,16 +448,63 @@ class EnhancedSchemaIdentificationAgent:
         """
         
         try:
-            response = self.llm_mapper.gemini_model.generate_content(prompt)
+            response_text = self._llm_call(prompt)
             # Parse JSON from response
-            json_match = re.search(r'\{[^}]*\}', response.text)
-            if json_match:
-                return json.loads(json_match.group())
+            extracted = self.llm_mapper.extract_json(response_text)
+            if isinstance(extracted, dict):
+                return extracted
         except Exception as e:
             logger.warning(f"LLM text extraction failed: {str(e)}")
         
         return {}
     
+    def _extract_batch_with_llm(self, texts: List[str]) -> List[Dict[str, str]]:
+        """
+        Use LLM to extract structured fields from several texts in one call.
+        
+        Args:
+            texts (List[str]): Texts to analyze
+            
+        Returns:
+            List[Dict[str, str]]: Extracted fields, one dict per input text
+        """
+        numbered_texts = "\n        ".join(f'{i + 1}. {json.dumps(text)}' for i, text in enumerate(texts))
+        prompt = f"""
+        Extract structured customer information from each of the following texts.
+        For every text return a JSON object with any of these fields you can identify:
+        - full_name (person's complete name)
+        - first_name (given name)
+        - last_name (family name/surname)
+        - email (email address)
+        - phone (phone number)
+        - address (physical address)
+        - dob (date of birth, format: YYYY-MM-DD)
+        - national_id (ID number, SSN, etc.)
+        - country (country name)
+        
+        Texts to analyze:
+        {numbered_texts}
+        
+        Respond with only a valid JSON array containing exactly {len(texts)} objects, in the same order as the texts:
+        """
+        
+        try:
+            response_text = self._llm_call(
+                prompt,
+                generation_config={'max_output_tokens': max(self.llm_mapper.max_tokens,
+                                                            LLM_TOKENS_PER_TEXT * len(texts))}
+            )
+            # Parse JSON array from response
+            results = self.llm_mapper.extract_json(response_text, opening='[')
+            if isinstance(results, list) and len(results) == len(texts):
+                return [result if isinstance(result, dict) else {} for result in results]
+            logger.warning(f"Batched LLM extraction returned an unusable response for {len(texts)} texts")
+        except Exception as e:
+            logger.warning(f"Batched LLM text extraction failed: {str(e)}")
+        
+        # Fall back to one call per text so a bad batch does not drop its records
+        return [self._extract_with_llm(text) for text in texts]
+    
     def process_structured_data(self, df: pd.DataFrame, source_name: str) -> Tuple[pd.DataFrame, Dict]:
         """
         Process structured data by mapping fields to unified schema.
@@ -306,14 +522,31 @@ class EnhancedSchemaIdentificationAgent:
         source_fields = list(df.columns)
         
         # Generate field mappings
+        field_mappings, unmapped_fields = self._map_source_fields(source_fields, source_name)
+        
+        return self._apply_source_mapping(df, field_mappings, unmapped_fields, source_name)
+    
+    def _map_source_fields(self, source_fields: List[str], source_name: str,
+                           fields: Optional[List[str]] = None) -> Tuple[Dict, List[Dict]]:
+        """
+        Map source fields to the unified schema, logging (and optionally adding to the
+        schema) the fields that cannot be mapped.
+        
+        Args:
+            source_fields (List[str]): All fields of the source, used as context
+            source_name (str): Name of the data source
+            fields (Optional[List[str]]): Fields to map (defaults to source_fields)
+            
+        Returns:
+            Tuple[Dict, List[Dict]]: (field_mappings, unmapped_fields)
+        """
         field_mappings = {}
         unmapped_fields = []
         
-        for field in source_fields:
-            unified_field, confidence = self.llm_mapper.map_field_to_unified_schema(
-                field, source_fields
-            )
-            
+        # Cached fields skip the LLM; the rest are mapped in one round-trip
+        batch_mappings = self._map_fields_cached(source_fields, fields)
+        
+        for field, (unified_field, confidence) in batch_mappings.items():
             if unified_field and confidence > 0.5:
                 field_mappings[field] = {
                     'unified_field': unified_field,
@@ -330,7 +563,7 @@ class EnhancedSchemaIdentificationAgent:
                     'context_fields': source_fields
                 }
                 unmapped_fields.append(unmapped_entry)
-                self.unmapped_fields.append(unmapped_entry)
+                self._append_unmapped(unmapped_entry)
                 
                 # Ask LLM if we should extend schema
                 if self.auto_extend_schema:
@@ -344,6 +577,24 @@ class EnhancedSchemaIdentificationAgent:
                             'auto_extended': True
                         }
         
+        return field_mappings, unmapped_fields
+    
+    def _apply_source_mapping(self, df: pd.DataFrame, field_mappings: Dict, unmapped_fields: List[Dict],
+                              source_name: str) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Transform source data with its field mappings and summarize the mapping.
+        
+        Args:
+            df (pd.DataFrame): Source data
+            field_mappings (Dict): Field mappings
+            unmapped_fields (List[Dict]): Unmapped field entries
+            source_name (str): Name of the data source
+            
+        Returns:
+            Tuple[pd.DataFrame, Dict]: (processed_df, mapping_info)
+        """
+        source_fields = list(df.columns)
+        
         # Apply mappings to create unified dataframe
         unified_df = self._apply_field_mappings(df, field_mappings, source_name)
         
@@ -374,30 +625,101 @@ class EnhancedSchemaIdentificationAgent:
         """
         logger.info(f"Processing unstructured data from {source_name}")
         
+        extracted_df = self._extract_unstructured_fields(df, source_name)
+        
+        # Extracted columns already carry unified field names and map to themselves; only
+        # fields outside the unified schema (extra keys returned by the LLM) need LLM mapping
+        source_fields = list(extracted_df.columns)
+        with self._schema_lock:
+            unified_fields = set(self.unified_schema.keys())
+        other_fields = [field for field in source_fields if field not in unified_fields]
+        
+        field_mappings, unmapped_fields = ({}, [])
+        if other_fields:
+            field_mappings, unmapped_fields = self._map_source_fields(source_fields, source_name, other_fields)
+        
+        # Canonical columns come last so they win over an extra key mapped to the same field
+        field_mappings.update(self._canonical_field_mappings(source_fields))
+        
+        return self._apply_source_mapping(extracted_df, field_mappings, unmapped_fields, source_name)
+    
+    def _extract_unstructured_fields(self, df: pd.DataFrame, source_name: str) -> pd.DataFrame:
+        """
+        Extract fields from unstructured text with the LLM and regex patterns.
+        
+        Args:
+            df (pd.DataFrame): Unstructured data, text in the first column
+            source_name (str): Name of the data source
+            
+        Returns:
+            pd.DataFrame: Extracted fields, plus source_name and raw_text
+        """
         # Identify the text column (usually the first or only column)
         text_column = df.columns[0]
         
-        # Process each row to extract structured fields
-        extracted_records = []
-        for idx, row in df.iterrows():
-            text = str(row[text_column])
-            extracted_fields = self.extract_fields_from_unstructured_text(text)
+        if not df.empty:
+            texts = df[text_column].astype(str)
             
-            # Add metadata
-            extracted_fields['source_name'] = source_name
-            extracted_fields['raw_text'] = text
+            # LLM extraction in batches of texts per prompt, several batches in flight at once
+            text_list = texts.tolist()
+            batches = [text_list[start:start + self.llm_batch_size]
+                       for start in range(0, len(text_list), self.llm_batch_size)]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                llm_futures = [executor.submit(self._extract_batch_with_llm, batch) for batch in batches]
+                
+                # Regex extraction runs locally while the LLM batches are pending
+                # First match per text: one Hyperscan pass per text, or column-wide re
+                if self._hs_db is not None:
+                    regex_df = pd.DataFrame([self._scan_fields(text) for text in texts],
+                                            index=texts.index, columns=list(self.EXTRACTION_PATTERNS))
+                else:
+                    regex_df = pd.DataFrame({
+                        field: texts.str.extract(pattern, expand=False)
+                        for field, pattern in self.EXTRACTION_PATTERNS.items()
+                    })
+                
+                # Collect in submission order so records stay aligned with their texts
+                llm_records = []
+                for future in llm_futures:
+                    llm_records.extend(future.result())
+            llm_df = pd.DataFrame(llm_records, index=texts.index)
             
-            extracted_records.append(extracted_fields)
-        
-        # Create dataframe from extracted records
-        if extracted_records:
-            extracted_df = pd.DataFrame(extracted_records)
+            # LLM values take precedence, regex fills whatever the LLM missed
+            extracted_df = llm_df.combine_first(regex_df).dropna(axis=1, how='all')
+            
+            # Add metadata
+            extracted_df['source_name'] = source_name
+            extracted_df['raw_text'] = texts
+            extracted_df = extracted_df.reset_index(drop=True)
         else:
             # Create empty dataframe with unified schema
-            extracted_df = pd.DataFrame(columns=list(self.unified_schema.keys()))
+            with self._schema_lock:
+                extracted_df = pd.DataFrame(columns=list(self.unified_schema.keys()))
+        
+        return extracted_df
+    
+    def _canonical_field_mappings(self, source_fields: List[str]) -> Dict:
+        """
+        Map the fields that already carry a unified field name to themselves.
         
-        # Now process as structured data
-        return self.process_structured_data(extracted_df, source_name)
+        Args:
+            source_fields (List[str]): Extracted fields
+            
+        Returns:
+            Dict: Field mappings for the fields in the unified schema
+        """
+        with self._schema_lock:
+            unified_fields = set(self.unified_schema.keys())
+        
+        timestamp = datetime.now().isoformat()
+        return {
+            field: {
+                'unified_field': field,
+                'confidence': 1.0,
+                'timestamp': timestamp
+            }
+            for field in source_fields if field in unified_fields
+        }
     
     def _should_extend_schema(self, field_name: str, context_fields: List[str]) -> bool:
         """
@@ -425,8 +747,7 @@ class EnhancedSchemaIdentificationAgent:
         """
         
         try:
-            response = self.llm_mapper.gemini_model.generate_content(prompt)
-            return "YES" in response.text.upper()
+            return "YES" in self._llm_call(prompt).upper()
         except Exception as e:
             logger.warning(f"Schema extension evaluation failed: {str(e)}")
             return False
@@ -438,10 +759,11 @@ class EnhancedSchemaIdentificationAgent:
         Args:
             field_name (str): Field name to add
         """
-        if field_name not in self.unified_schema:
-            self.unified_schema[field_name] = ""
-            self._save_unified_schema(self.unified_schema)
-            logger.info(f"Extended unified schema with new field: {field_name}")
+        with self._schema_lock:
+            if field_name not in self.unified_schema:
+                self.unified_schema[field_name] = ""
+                self._save_unified_schema(self.unified_schema)
+                logger.info(f"Extended unified schema with new field: {field_name}")
     
     def _apply_field_mappings(self, df: pd.DataFrame, mappings: Dict, source_name: str) -> pd.DataFrame:
         """
@@ -455,23 +777,29 @@ class EnhancedSchemaIdentificationAgent:
         Returns:
             pd.DataFrame: Transformed dataframe
         """
-        # Create new dataframe with unified schema
-        unified_df = pd.DataFrame(columns=list(self.unified_schema.keys()))
+        with self._schema_lock:
+            unified_columns = list(self.unified_schema.keys())
         
-        # Apply mappings
+        # Select mapped columns under their unified names (a later mapping to the same field wins)
+        mapped_columns = {}
         for source_field, mapping_info in mappings.items():
             unified_field = mapping_info['unified_field']
-            if source_field in df.columns and unified_field in unified_df.columns:
-                unified_df[unified_field] = df[source_field]
+            if source_field in df.columns and unified_field in unified_columns:
+                mapped_columns[unified_field] = df[source_field]
+        
+        # Build the unified dataframe in one shot; without any mapped column it has no rows
+        if mapped_columns:
+            # Unmapped columns are created already filled, so only mapped ones need checking for all-missing values
+            unified_df = pd.DataFrame(mapped_columns, index=df.index).reindex(columns=unified_columns, fill_value="")
+            empty_columns = [field for field, values in mapped_columns.items() if values.isna().all()]
+            if empty_columns:
+                unified_df[empty_columns] = ""
+        else:
+            unified_df = pd.DataFrame(columns=unified_columns)
         
         # Add metadata
         unified_df['source_name'] = source_name
         
-        # Fill missing values
-        for col in unified_df.columns:
-            if unified_df[col].isna().all():
-                unified_df[col] = ""
-        
         return unified_df
     
     def _handle_name_fields(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -484,32 +812,36 @@ class EnhancedSchemaIdentificationAgent:
         Returns:
             pd.DataFrame: DataFrame with properly handled name fields
         """
+        if not {'first_name', 'last_name', 'full_name'}.issubset(df.columns):
+            return df
+        
+        # Emptiness of each name column, computed once for both passes
+        empty_first = df['first_name'].isna() | (df['first_name'] == "")
+        empty_last = df['last_name'].isna() | (df['last_name'] == "")
+        empty_full = df['full_name'].isna() | (df['full_name'] == "")
+        
         # If we have first_name and last_name but no full_name, derive it
-        if 'first_name' in df.columns and 'last_name' in df.columns and 'full_name' in df.columns:
-            mask = (df['full_name'].isna() | (df['full_name'] == "")) & \
-                   (df['first_name'].notna() & (df['first_name'] != "")) & \
-                   (df['last_name'].notna() & (df['last_name'] != ""))
-            
-            df.loc[mask, 'full_name'] = df.loc[mask, 'first_name'] + ' ' + df.loc[mask, 'last_name']
-            
-            logger.info(f"Derived {mask.sum()} full_name values from first_name + last_name")
+        mask = empty_full & ~empty_first & ~empty_last
+        
+        df.loc[mask, 'full_name'] = df.loc[mask, 'first_name'] + ' ' + df.loc[mask, 'last_name']
+        
+        logger.info(f"Derived {mask.sum()} full_name values from first_name + last_name")
         
         # If we have full_name but missing first_name/last_name, try to split
-        if 'full_name' in df.columns and 'first_name' in df.columns and 'last_name' in df.columns:
-            mask = (df['full_name'].notna() & (df['full_name'] != "")) & \
-                   ((df['first_name'].isna() | (df['first_name'] == "")) | \
-                    (df['last_name'].isna() | (df['last_name'] == "")))
-            
-            for idx in df[mask].index:
-                full_name = str(df.loc[idx, 'full_name']).strip()
-                name_parts = full_name.split()
-                if len(name_parts) >= 2:
-                    if df.loc[idx, 'first_name'] == "" or pd.isna(df.loc[idx, 'first_name']):
-                        df.loc[idx, 'first_name'] = name_parts[0]
-                    if df.loc[idx, 'last_name'] == "" or pd.isna(df.loc[idx, 'last_name']):
-                        df.loc[idx, 'last_name'] = ' '.join(name_parts[1:])
-            
-            logger.info(f"Split {mask.sum()} full_name values into first_name + last_name")
+        # (rows filled above have both parts, so the original emptiness still applies)
+        mask = ~empty_full & (empty_first | empty_last)
+        
+        # Only names with at least two parts are split
+        name_parts = df.loc[mask, 'full_name'].astype(str).str.split()
+        name_parts = name_parts[name_parts.str.len() >= 2]
+        split_mask = df.index.isin(name_parts.index)
+        
+        need_first = split_mask & empty_first
+        df.loc[need_first, 'first_name'] = name_parts.str[0].loc[df.index[need_first]].values
+        need_last = split_mask & empty_last
+        df.loc[need_last, 'last_name'] = name_parts.str[1:].str.join(' ').loc[df.index[need_last]].values
+        
+        logger.info(f"Split {mask.sum()} full_name values into first_name + last_name")
         
         return df
     
@@ -525,100 +857,238 @@ class EnhancedSchemaIdentificationAgent:
         
         results = {}
         
-        for source_name, source_info in self.discovered_sources.items():
-            try:
-                logger.info(f"Processing source: {source_name}")
-                
-                # Load data
-                df = self._load_source_data(source_info)
-                
-                if df is None or df.empty:
-                    logger.warning(f"Skipping empty source: {source_name}")
-                    continue
-                
-                # Detect if structured or unstructured
-                is_unstructured = self.detect_if_unstructured(df)
-                
-                # Process accordingly
+        # Sources are dominated by file reads and LLM calls, so process them in parallel
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_source = {
+                executor.submit(self._process_one_source, source_name, source_info): source_name
+                for source_name, source_info in self.discovered_sources.items()
+            }
+            
+            for future in as_completed(future_to_source):
+                source_name = future_to_source[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {source_name}: {str(e)}")
+                    result = {
+                        'status': 'error',
+                        'error': str(e)
+                    }
+                if result is not None:
+                    results[source_name] = result
+        
+        # Report results in discovery order
+        results = {name: results[name] for name in self.discovered_sources if name in results}
+        
+        return results
+    
+    def _process_one_source(self, source_name: str, source_info: Dict) -> Optional[Dict]:
+        """
+        Load, process and save a single discovered source.
+        
+        Args:
+            source_name (str): Name of the source
+            source_info (Dict): Source metadata
+            
+        Returns:
+            Optional[Dict]: Processing result, or None if the source is empty
+        """
+        logger.info(f"Processing source: {source_name}")
+        
+        # Stream the source in chunks of batch_size records
+        chunks = self._iter_source_chunks(source_info)
+        df = next(chunks, None)
+        
+        if df is None or df.empty:
+            logger.warning(f"Skipping empty source: {source_name}")
+            return None
+        
+        # Detect if structured or unstructured from the first chunk
+        is_unstructured = self.detect_if_unstructured(df)
+        
+        # Process the first chunk accordingly; this fixes the field mapping for the source
+        if is_unstructured:
+            processed_df, mapping_info = self.process_unstructured_data(df, source_name)
+        else:
+            processed_df, mapping_info = self.process_structured_data(df, source_name)
+        
+        # Save results
+        self._save_processed_data(processed_df, source_name)
+        output_columns = list(processed_df.columns)
+        records_processed = len(processed_df)
+        
+        try:
+            # Remaining chunks reuse the first chunk's field mapping and are appended to the output
+            for chunk in chunks:
+                field_mappings = mapping_info['field_mappings']
                 if is_unstructured:
-                    processed_df, mapping_info = self.process_unstructured_data(df, source_name)
-                else:
-                    processed_df, mapping_info = self.process_structured_data(df, source_name)
-                
-                # Save results
-                self._save_processed_data(processed_df, source_name)
-                self._save_mapping_info(mapping_info, source_name)
-                
-                results[source_name] = {
-                    'status': 'success',
-                    'is_unstructured': is_unstructured,
-                    'records_processed': len(processed_df),
-                    'mapping_info': mapping_info
-                }
+                    # Canonical fields the first chunk did not yield still map to themselves;
+                    # extra LLM keys it did not yield are dropped, like unseen structured columns
+                    chunk = self._extract_unstructured_fields(chunk, source_name)
+                    field_mappings = {**field_mappings, **self._canonical_field_mappings(list(chunk.columns))}
                 
-                logger.info(f"Successfully processed {source_name}: {len(processed_df)} records")
+                chunk_df = self._apply_field_mappings(chunk, field_mappings, source_name)
+                chunk_df = self._handle_name_fields(chunk_df)
                 
-            except Exception as e:
-                logger.error(f"Error processing {source_name}: {str(e)}")
-                results[source_name] = {
-                    'status': 'error',
-                    'error': str(e)
-                }
+                chunk_df = chunk_df.reindex(columns=output_columns, fill_value="")
+                self._save_processed_data(chunk_df, source_name, append=True)
+                records_processed += len(chunk_df)
+        finally:
+            self._close_processed_data(source_name)
         
-        # Save unmapped fields log
-        self._save_unmapped_fields()
+        self._save_mapping_info(mapping_info, source_name)
         
-        return results
+        logger.info(f"Successfully processed {source_name}: {records_processed} records")
+        
+        return {
+            'status': 'success',
+            'is_unstructured': is_unstructured,
+            'records_processed': records_processed,
+            'mapping_info': mapping_info
+        }
     
-    def _load_source_data(self, source_info: Dict) -> Optional[pd.DataFrame]:
+    def _iter_source_chunks(self, source_info: Dict) -> Iterator[pd.DataFrame]:
         """
-        Load data from a source file.
+        Read a source file in chunks of batch_size records.
         
         Args:
             source_info (Dict): Source metadata
             
         Returns:
-            Optional[pd.DataFrame]: Loaded data or None if failed
+            Iterator[pd.DataFrame]: Chunks of the source data
         """
         file_path = source_info['file_path']
         file_type = source_info['file_type']
         
-        try:
-            if file_type == '.csv':
-                df = pd.read_csv(file_path)
-            elif file_type == '.xlsx':
-                df = pd.read_excel(file_path)
-            elif file_type == '.json':
-                df = pd.read_json(file_path, lines=True)
-            else:
-                logger.error(f"Unsupported file type: {file_type}")
-                return None
+        if file_type == '.csv':
+            yield from self._iter_csv_chunks(file_path)
+        elif file_type == '.json':
+            yield from pd.read_json(file_path, lines=True, chunksize=self.batch_size)
+        elif file_type == '.xlsx':
+            if not OPENPYXL_AVAILABLE:
+                logger.warning("openpyxl not installed, loading the whole Excel file at once")
+                yield pd.read_excel(file_path)
+                return
             
-            logger.info(f"Loaded {len(df)} records from {file_path}")
-            return df
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.worksheets[0].iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    return
+                columns = [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+                
+                batch = []
+                for row in rows:
+                    if all(value is None for value in row):
+                        continue
+                    batch.append(row)
+                    if len(batch) >= self.batch_size:
+                        yield pd.DataFrame(batch, columns=columns)
+                        batch = []
+                if batch:
+                    yield pd.DataFrame(batch, columns=columns)
+            finally:
+                workbook.close()
+        else:
+            logger.error(f"Unsupported file type: {file_type}")
+    
+    def _iter_csv_chunks(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """
+        Read a CSV file in chunks of batch_size records, parsing with pyarrow's
+        multithreaded streaming reader when it is installed.
+        
+        Args:
+            file_path (str): Path to the CSV file
             
-        except Exception as e:
-            logger.error(f"Error loading {file_path}: {str(e)}")
-            return None
+        Returns:
+            Iterator[pd.DataFrame]: Chunks of the CSV data
+        """
+        chunks_read = 0
+        if PYARROW_AVAILABLE:
+            try:
+                # Empty strings are nulls, as with pandas' default parser
+                reader = pa_csv.open_csv(file_path,
+                                         convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))
+                
+                # Arrow streams blocks of bytes; regroup them into batch_size rows
+                pending, pending_rows = [], 0
+                for record_batch in reader:
+                    pending.append(record_batch)
+                    pending_rows += record_batch.num_rows
+                    while pending_rows >= self.batch_size:
+                        table = pa.Table.from_batches(pending)
+                        yield table.slice(0, self.batch_size).to_pandas()
+                        chunks_read += 1
+                        rest = table.slice(self.batch_size)
+                        pending, pending_rows = rest.to_batches(), rest.num_rows
+                if pending_rows:
+                    yield pa.Table.from_batches(pending).to_pandas()
+                return
+            except pa.ArrowInvalid as e:
+                # Arrow fixes column types from the first block; mixed columns need pandas
+                logger.warning(f"pyarrow could not parse {file_path}, continuing with pandas: {str(e)}")
+        
+        for i, chunk in enumerate(pd.read_csv(file_path, chunksize=self.batch_size)):
+            if i >= chunks_read:
+                yield chunk
     
-    def _save_processed_data(self, df: pd.DataFrame, source_name: str):
+    def _save_processed_data(self, df: pd.DataFrame, source_name: str, append: bool = False):
         """
-        Save processed data to CSV file.
+        Save processed data to a CSV or Parquet file, depending on output_format.
         
         Args:
             df (pd.DataFrame): Processed data
             source_name (str): Source name
+            append (bool): Append rows to the existing file instead of overwriting it
         """
-        output_file = Path(self.processed_data_dir) / f"{source_name}.csv"
+        output_file = Path(self.processed_data_dir) / f"{source_name}.{self.output_format}"
         try:
-            df.to_csv(output_file, index=False)
-            logger.info(f"Saved processed data to {output_file}")
+            if self.output_format == 'parquet':
+                self._write_parquet_chunk(df, source_name, output_file, append)
+            else:
+                df.to_csv(output_file, index=False, mode='a' if append else 'w', header=not append)
+            logger.info(f"{'Appended' if append else 'Saved'} processed data to {output_file}")
         except Exception as e:
             logger.error(f"Error saving processed data: {str(e)}")
     
+    def _write_parquet_chunk(self, df: pd.DataFrame, source_name: str, output_file: Path, append: bool):
+        """
+        Write a chunk of processed data to the source's zstd-compressed Parquet file.
+        
+        Columns are stored as nullable strings, like the CSV output, so every chunk
+        shares the schema of the first one regardless of inferred dtypes.
+        
+        Args:
+            df (pd.DataFrame): Processed data
+            source_name (str): Source name
+            output_file (Path): Parquet file path
+            append (bool): Add a row group to the open writer instead of starting a new file
+        """
+        schema = pa.schema([(str(column), pa.string()) for column in df.columns])
+        if not append:
+            self._close_processed_data(source_name)
+            self._parquet_writers[source_name] = pa_parquet.ParquetWriter(output_file, schema, compression='zstd')
+        
+        values = df.astype(str).where(df.notna(), None)
+        values.columns = schema.names
+        table = pa.Table.from_pandas(values, schema=schema, preserve_index=False)
+        self._parquet_writers[source_name].write_table(table)
+    
+    def _close_processed_data(self, source_name: str):
+        """
+        Finish the processed data file of a source (closes its Parquet writer, if any).
+        
+        Args:
+            source_name (str): Source name
+        """
+        writer = self._parquet_writers.pop(source_name, None)
+        if writer is not None:
+            writer.close()
+    
     def _save_mapping_info(self, mapping_info: Dict, source_name: str):
         """
-        Save mapping information to JSON file.
+        Save mapping information to JSON file, with orjson when it is installed.
         
         Args:
             mapping_info (Dict): Mapping information
@@ -626,8 +1096,14 @@ class EnhancedSchemaIdentificationAgent:
         """
         mapping_file = Path(self.schema_mappings_dir) / f"{source_name}_map.json"
         try:
-            with open(mapping_file, 'w') as f:
-                json.dump(mapping_info, f, indent=2)
+            if ORJSON_AVAILABLE:
+                mapping_file.write_bytes(orjson.dumps(
+                    mapping_info,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
+            else:
+                with open(mapping_file, 'w') as f:
+                    json.dump(mapping_info, f, indent=2)
             logger.info(f"Saved mapping info to {mapping_file}")
         except Exception as e:
             logger.error(f"Error saving mapping info: {str(e)}")
@@ -655,11 +1131,11 @@ class EnhancedSchemaIdentificationAgent:
             schema (List[str]): List of field names
             
         Returns:
-            str: MD5 hash of the sorted schema fields
+            str: 64-bit BLAKE2b hash of the sorted schema fields
         """
-        # Sort and join the schema fields to ensure consistent hashing
+        # Sort and join the schema fields to ensure consistent hashing; this is a cache key, not a security digest
         schema_str = '|'.join(sorted(schema))
-        return hashlib.md5(schema_str.encode()).hexdigest()
+        return hashlib.blake2b(schema_str.encode(), digest_size=8).hexdigest()
     
     def _get_cached_mapping(self, schema_hash: str) -> Optional[Dict]:
         """
@@ -696,6 +1172,158 @@ class EnhancedSchemaIdentificationAgent:
         except Exception as e:
             logger.warning(f"Failed to write cache file {cache_file}: {str(e)}")
     
+    def _field_mapping_key(self, field: str, schema_hash: str) -> str:
+        """
+        Build the cache key for one field mapped in the context of its source fields.
+        
+        Args:
+            field (str): Field name to map
+            schema_hash (str): Hash of all source fields (see _get_schema_hash)
+            
+        Returns:
+            str: Cache key of the field name and the source schema hash
+        """
+        return f"{field}|{schema_hash}"
+    
+    def _read_field_mappings(self, keys: List[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """
+        Read per-field mappings from the persistent cache.
+        
+        Args:
+            keys (List[str]): Cache keys to look up
+            
+        Returns:
+            Dict[str, Tuple[Optional[str], float]]: key -> (unified_field, confidence) for cached keys
+        """
+        if self._mapping_db is None or not keys:
+            return {}
+        
+        try:
+            placeholders = ','.join('?' * len(keys))
+            with self._mapping_db_lock:
+                # Failed mappings written by earlier releases are retried, not reused
+                rows = self._mapping_db.execute(
+                    f"SELECT key, unified, confidence FROM mappings WHERE key IN ({placeholders}) "
+                    f"AND NOT (unified IS NULL AND confidence = 0.0)", keys
+                ).fetchall()
+            return {key: (unified, confidence) for key, unified, confidence in rows}
+        except Exception as e:
+            logger.warning(f"Failed to read field mapping cache: {str(e)}")
+            return {}
+    
+    def _write_field_mappings(self, mappings: Dict[str, Tuple[Optional[str], float]]):
+        """
+        Write per-field mappings to the persistent cache.
+        
+        (None, 0.0) results are not written: the LLM mapper also returns them for
+        unparseable responses, so those fields are retried on the next run.
+        
+        Args:
+            mappings (Dict[str, Tuple[Optional[str], float]]): key -> (unified_field, confidence)
+        """
+        mappings = {key: (unified, confidence) for key, (unified, confidence) in mappings.items()
+                    if not (unified is None and confidence == 0.0)}
+        if self._mapping_db is None or not mappings:
+            return
+        
+        try:
+            with self._mapping_db_lock:
+                self._mapping_db.executemany(
+                    "INSERT OR REPLACE INTO mappings(key, unified, confidence) VALUES (?, ?, ?)",
+                    [(key, unified, confidence) for key, (unified, confidence) in mappings.items()]
+                )
+                self._mapping_db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write field mapping cache: {str(e)}")
+    
+    def _llm_call(self, prompt: str, **kwargs) -> str:
+        """
+        Send a prompt to the LLM, answering repeated prompts from the persistent cache.
+        
+        Args:
+            prompt (str): Prompt text
+            **kwargs: Extra arguments for generate_content (part of the cache key)
+            
+        Returns:
+            str: Response text
+        """
+        key = hashlib.blake2b(f"{prompt}|{sorted(kwargs.items())}".encode(), digest_size=16).hexdigest()
+        
+        if self._mapping_db is not None:
+            try:
+                with self._mapping_db_lock:
+                    row = self._mapping_db.execute(
+                        "SELECT response FROM llm_responses WHERE key = ?", (key,)
+                    ).fetchone()
+                if row is not None:
+                    return row[0]
+            except Exception as e:
+                logger.warning(f"Failed to read LLM response cache: {str(e)}")
+        
+        response_text = self.llm_mapper.gemini_model.generate_content(prompt, **kwargs).text
+        
+        if self._mapping_db is not None:
+            try:
+                with self._mapping_db_lock:
+                    self._mapping_db.execute(
+                        "INSERT OR REPLACE INTO llm_responses(key, response) VALUES (?, ?)", (key, response_text)
+                    )
+                    self._mapping_db.commit()
+            except Exception as e:
+                logger.warning(f"Failed to write LLM response cache: {str(e)}")
+        
+        return response_text
+    
+    def _cached_field_mapping(self, field: str, source_fields: Tuple[str, ...]) -> Tuple[Optional[str], float]:
+        """
+        Map a single field, checking the persistent cache before calling the LLM.
+        Wrapped with an in-process LRU cache in _init_cache.
+        
+        Args:
+            field (str): Field name to map
+            source_fields (Tuple[str, ...]): All source fields
+            
+        Returns:
+            Tuple[Optional[str], float]: (unified_field, confidence)
+        """
+        key = self._field_mapping_key(field, self._get_schema_hash([str(f) for f in source_fields]))
+        cached = self._read_field_mappings([key])
+        if key in cached:
+            return cached[key]
+        
+        mapping = self.llm_mapper.map_field_to_unified_schema(field, list(source_fields))
+        self._write_field_mappings({key: mapping})
+        return mapping
+    
+    def _map_fields_cached(self, source_fields: List[str],
+                           fields: Optional[List[str]] = None) -> Dict[str, Tuple[Optional[str], float]]:
+        """
+        Map fields of a source, sending only fields missing from the persistent
+        cache to the LLM in one batched call.
+        
+        Args:
+            source_fields (List[str]): All source fields
+            fields (Optional[List[str]]): Fields to map (defaults to source_fields)
+            
+        Returns:
+            Dict[str, Tuple[Optional[str], float]]: field -> (unified_field, confidence)
+        """
+        if fields is None:
+            fields = source_fields
+        
+        schema_hash = self._get_schema_hash([str(f) for f in source_fields])
+        keys = {field: self._field_mapping_key(field, schema_hash) for field in fields}
+        cached = self._read_field_mappings(list(keys.values()))
+        
+        misses = [field for field in fields if keys[field] not in cached]
+        if misses:
+            logger.info(f"Field mapping cache: {len(fields) - len(misses)} hits, {len(misses)} misses")
+            fresh = self.llm_mapper.map_fields_batch(misses, source_fields)
+            self._write_field_mappings({keys[field]: mapping for field, mapping in fresh.items()})
+            cached.update({keys[field]: mapping for field, mapping in fresh.items()})
+        
+        return {field: cached[keys[field]] for field in fields}
+    
     def _ensure_directories(self):
         """Ensure that required directories exist, create them if they don't."""
         Path(self.data_sources_dir).mkdir(parents=True, exist_ok=True)
@@ -714,25 +1342,28 @@ class EnhancedSchemaIdentificationAgent:
         
         discovered = {}
         
-        # Scan for supported file types
+        # Scan for supported file types; scandir entries carry file type (and usually stat) from the directory read
         data_dir = Path(self.data_sources_dir)
-        for file_path in data_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_FILE_TYPES:
-                source_name = file_path.stem  # filename without extension
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                source_name, suffix = os.path.splitext(entry.name)  # filename without extension
+                file_type = suffix.lower()
+                if file_type not in SUPPORTED_FILE_TYPES or not entry.is_file():
+                    continue
                 
                 # Get file metadata
-                file_stats = file_path.stat()
+                file_stats = entry.stat()
                 source_info = {
-                    'file_path': str(file_path),
-                    'file_name': file_path.name,
-                    'file_type': file_path.suffix.lower(),
+                    'file_path': str(data_dir / entry.name),
+                    'file_name': entry.name,
+                    'file_type': file_type,
                     'file_size': file_stats.st_size,
                     'modified_time': datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
                     'source_name': source_name
                 }
                 
                 discovered[source_name] = source_info
-                logger.info(f"Discovered source: {source_name} ({file_path.name})")
+                logger.info(f"Discovered source: {source_name} ({entry.name})")
         
         self.discovered_sources = discovered
         logger.info(f"Total sources discovered: {len(discovered)}")
@@ -789,7 +1420,7 @@ class EnhancedSchemaIdentificationAgent:
             Tuple[str, Dict]: Field name and its mapping information
         """
         try:
-            unified_field, confidence = self.llm_mapper.map_field_to_unified_schema(field, source_fields)
+            unified_field, confidence = self._cached_field_mapping(field, tuple(source_fields))
             if unified_field:
                 return field, {
                     "unified_field": unified_field,
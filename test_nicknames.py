@@ -0,0 +1,67 @@
+"""
+Test script for the nickname table of the Profile Matching Agent
+Checks that merging the duplicate nickname keys kept every variant
+"""
+
+import logging
+import tempfile
+from agents.profile_matching_agent import ProfileMatchingAgent
+
+logging.disable(logging.CRITICAL)
+
+# Names that used to appear twice in the nicknames literal, with the nicknames of each entry
+FORMERLY_DUPLICATED = {
+    'sarah': (('sara',), ('sally',)),
+    'karen': (('kare',), ('kay',)),
+    'nancy': (('nan',), ('ann',)),
+    'lisa': (('lise',), ('liz',)),
+    'betty': (('beth',), ('bette',)),
+    'helen': (('nell',), ('lena',)),
+    'sandra': (('sandy',), ('sandi',)),
+    'donna': (('don',), ('dona',)),
+    'carol': (('carrie',), ('carolina',))
+}
+
+def make_agents():
+    """Create one agent scanning names with Aho-Corasick (if installed) and one without"""
+    agent = ProfileMatchingAgent(profiles_dir=tempfile.mkdtemp())
+    plain_agent = ProfileMatchingAgent(profiles_dir=tempfile.mkdtemp())
+    plain_agent._nickname_automaton = None
+    return [agent, plain_agent]
+
+def test_merged_nickname_table():
+    """Each formerly duplicated name lists the nicknames of both entries"""
+    nicknames = ProfileMatchingAgent.NAME_PATTERNS['nicknames']
+    for full_name, (first, second) in FORMERLY_DUPLICATED.items():
+        assert set(nicknames[full_name]) == set(first) | set(second), full_name
+
+def test_merged_nickname_targets():
+    """Both nickname sets are matched in both directions"""
+    for agent in make_agents():
+        for full_name, (first, second) in FORMERLY_DUPLICATED.items():
+            # Full name in the query -> every nickname is a target
+            targets = set(agent._nickname_targets(full_name))
+            assert set(first) | set(second) <= targets, (full_name, targets)
+            
+            # Nickname in the query -> the full name is a target
+            for nickname in first + second:
+                assert full_name in agent._nickname_targets(nickname), (nickname, full_name)
+
+def test_maria_mary():
+    """maria and mary match each other from a single table entry"""
+    for agent in make_agents():
+        assert 'mary' in agent._nickname_targets('maria')
+        assert 'maria' in agent._nickname_targets('mary')
+
+def main():
+    print("=== Nickname Table Test ===")
+    
+    for test in [test_merged_nickname_table, test_merged_nickname_targets, test_maria_mary]:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+
+if __name__ == "__main__":
+    main()
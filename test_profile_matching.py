@@ -0,0 +1,116 @@
+"""
+Test script for the Profile Matching Agent's search shortcuts
+Compares blocked, pruned and exact-ID scoring against scoring every record in full,
+on queries built from the processed sample data in output/
+"""
+
+import logging
+import random
+import tempfile
+import email_validator
+from agents.profile_matching_agent import ProfileMatchingAgent
+
+logging.disable(logging.CRITICAL)
+
+# Keep email normalization offline: no DNS lookups for deliverability
+email_validator.CHECK_DELIVERABILITY = False
+
+NUM_QUERIES = 150
+QUERY_FIELDS = ['full_name', 'dob', 'national_id', 'email', 'phone']
+
+def make_agent(**settings):
+    """Create an agent with some matching settings overridden"""
+    agent = ProfileMatchingAgent(profiles_dir=tempfile.mkdtemp())
+    for name, value in settings.items():
+        setattr(agent, name, value)
+    return agent
+
+def make_queries(data, seed=0):
+    """Build queries from random sample records, with a typo in about half of the values"""
+    rng = random.Random(seed)
+    records = [record for df in data.values() for record in df.fillna('').to_dict('records')]
+    
+    queries = []
+    while len(queries) < NUM_QUERIES:
+        record = rng.choice(records)
+        query = {}
+        for field in QUERY_FIELDS:
+            value = str(record.get(field, ''))
+            if not value or rng.random() < 0.4:
+                continue
+            if rng.random() < 0.5:
+                position = rng.randrange(len(value))
+                value = value[:position] + rng.choice('abcxyz019 ') + value[position + 1:]
+            query[field] = value
+        if query:
+            queries.append(query)
+    return queries
+
+def full_scoring_agent():
+    """Agent that scores every record on every field: no blocking and no pruning"""
+    return make_agent(BLOCKING_MIN_RECORDS=float('inf'), ACCEPT_MIN_FIELDS=0)
+
+def test_blocking_matches_full_scoring():
+    """Blocking every source finds the same matches as scoring every record"""
+    reference = full_scoring_agent()
+    blocked = make_agent(BLOCKING_MIN_RECORDS=0, ACCEPT_MIN_FIELDS=0)
+    data = reference.load_processed_data()
+    assert data, "No processed data in output/"
+    
+    for query in make_queries(data, seed=1):
+        assert blocked.find_matches(query, data) == reference.find_matches(query, data), query
+
+def test_pruning_matches_full_scoring():
+    """Pruning hopeless records finds the same matches as scoring every field"""
+    reference = full_scoring_agent()
+    pruned = make_agent(BLOCKING_MIN_RECORDS=float('inf'))
+    data = reference.load_processed_data()
+    
+    for query in make_queries(data, seed=2):
+        assert pruned.find_matches(query, data) == reference.find_matches(query, data), query
+
+def test_default_settings_match_full_scoring():
+    """Default blocking and pruning together find the same matches as full scoring"""
+    reference = full_scoring_agent()
+    agent = make_agent()
+    data = reference.load_processed_data()
+    
+    for query in make_queries(data, seed=3):
+        assert agent.find_matches(query, data) == reference.find_matches(query, data), query
+
+def test_exact_id_short_circuit():
+    """An exact ID match is accepted on the ID alone, without scoring other fields"""
+    agent = make_agent()
+    data = agent.load_processed_data()
+    
+    checked = 0
+    for source_name, df in data.items():
+        if 'national_id' not in df.columns:
+            continue
+        for record in df.fillna('').to_dict('records')[:5]:
+            if not record['national_id'] or not record.get('full_name'):
+                continue
+            
+            # A wrong name must not matter once the ID matches exactly
+            query = {'full_name': 'Nobody Atall', 'national_id': str(record['national_id'])}
+            matches = agent.find_matches(query, {source_name: df}).get(source_name, [])
+            exact = [match for match in matches if match['national_id'] == record['national_id']]
+            assert exact, query
+            assert all(match['field_scores'] == {'national_id': 100.0} for match in exact), exact
+            checked += 1
+    
+    assert checked, "No records with a national_id in output/"
+
+def main():
+    print("=== Profile Matching Shortcuts Test ===")
+    
+    for test in [test_blocking_matches_full_scoring, test_pruning_matches_full_scoring,
+                 test_default_settings_match_full_scoring, test_exact_id_short_circuit]:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,7 @@ LLM Service module for AI-powered schema mapping using Google Gemini API.
 import json
 import logging
 import os
-import re
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from utils.config import LLM_CONFIG
 
 # Import dependencies
@@ -34,6 +33,9 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Unified schema vocabulary offered to the model in mapping prompts
+UNIFIED_SCHEMA_FIELDS = ["customer_id", "first_name", "last_name", "full_name", "dob", "email", "phone", "address", "national_id", "country", "source_name", "raw_text"]
+
 class LLMSchemaMapper:
     """
     LLM service for AI-powered schema mapping using Google Gemini API.
@@ -94,6 +96,42 @@ class LLMSchemaMapper:
         """
         return self._call_gemini_api(source_field, source_context)
     
+    def map_fields_batch(self, source_fields: List[str],
+                         source_context: Optional[List[str]] = None) -> Dict[str, Tuple[Optional[str], float]]:
+        """
+        Map all field names of a source to the unified schema with a single LLM call.
+        
+        Fields the batched response does not cover fall back to one
+        map_field_to_unified_schema call each.
+        
+        Args:
+            source_fields (List[str]): Field names from the source system
+            source_context (Optional[List[str]]): All field names in the source, when only
+                some of them need mapping (defaults to source_fields)
+            
+        Returns:
+            Dict[str, Tuple[Optional[str], float]]: field -> (mapped_field_name, confidence_score)
+        """
+        if not self.gemini_model:
+            raise ValueError("Gemini model not initialized")
+        
+        source_context = source_context or source_fields
+        
+        mappings = {}
+        if source_fields:
+            prompt = self._create_batch_mapping_prompt(source_fields, source_context)
+            try:
+                response = self.gemini_model.generate_content(prompt)
+                mappings = self._parse_batch_llm_response(response.text, source_fields)
+            except Exception as e:
+                logger.warning(f"Batched Gemini mapping failed, mapping fields individually: {str(e)}")
+        
+        for field in source_fields:
+            if field not in mappings:
+                mappings[field] = self.map_field_to_unified_schema(field, source_context)
+        
+        return mappings
+    
     def _call_gemini_api(self, source_field: str, source_context: List[str]) -> Tuple[Optional[str], float]:
         """
         Call Google Gemini API for schema mapping.
@@ -137,7 +175,7 @@ class LLMSchemaMapper:
         Other fields in the same source (context): {source_context}
         
         Unified schema fields available:
-        ["customer_id", "first_name", "last_name", "full_name", "dob", "email", "phone", "address", "national_id", "country", "source_name", "raw_text"]
+        {json.dumps(UNIFIED_SCHEMA_FIELDS)}
         
         Please respond with:
         1. The best matching unified field name (or "None" if no good match)
@@ -150,6 +188,100 @@ class LLMSchemaMapper:
         
         return prompt
     
+    @staticmethod
+    def extract_json(response_text: str, opening: str = '{') -> Optional[Any]:
+        """
+        Decode the first JSON value in an LLM response, starting at the first opening bracket.
+        Handles nested objects and surrounding prose or code fences.
+        
+        Args:
+            response_text (str): Raw response from LLM
+            opening (str): '{' for a JSON object, '[' for a JSON array
+            
+        Returns:
+            Optional[Any]: Decoded JSON value, or None if no valid JSON was found
+        """
+        start = response_text.find(opening)
+        if start == -1:
+            return None
+        
+        try:
+            parsed, _ = json.JSONDecoder().raw_decode(response_text, start)
+            return parsed
+        except json.JSONDecodeError:
+            return None
+    
+    def _create_batch_mapping_prompt(self, source_fields: List[str], source_context: List[str]) -> str:
+        """
+        Create a prompt for LLM to map every field of a source in one response.
+        
+        Args:
+            source_fields (List[str]): Field names to map
+            source_context (List[str]): All field names in the same source
+            
+        Returns:
+            str: Formatted prompt for LLM
+        """
+        prompt = f"""
+        You are an expert data engineer specializing in schema mapping and data integration.
+        
+        Given all field names from a source system, map each one to the most appropriate field in our unified schema.
+        
+        Source fields to map: {json.dumps([str(field) for field in source_fields])}
+        All fields in the same source (context): {json.dumps([str(field) for field in source_context])}
+        
+        Unified schema fields available:
+        {json.dumps(UNIFIED_SCHEMA_FIELDS)}
+        
+        For every source field respond with:
+        1. The best matching unified field name (or "None" if no good match)
+        2. A confidence score from 0.0 to 1.0
+        
+        Format your response as a single JSON object keyed by source field name:
+        {{"source_field": {{"unified_field": "field_name", "confidence": 0.85}}}}
+        """
+        
+        return prompt
+    
+    def _parse_batch_llm_response(self, response_text: str, source_fields: List[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """
+        Parse a batched LLM response into per-field mappings.
+        
+        Args:
+            response_text (str): Raw response from LLM
+            source_fields (List[str]): Field names that were requested
+            
+        Returns:
+            Dict[str, Tuple[Optional[str], float]]: field -> (unified_field_name, confidence_score);
+                fields missing from the response are left out
+        """
+        try:
+            parsed = self.extract_json(response_text)
+            if not isinstance(parsed, dict):
+                logger.warning(f"Could not parse batched LLM response: {response_text}")
+                return {}
+            
+            fields_by_name = {str(field): field for field in source_fields}
+            mappings = {}
+            for name, mapping in parsed.items():
+                field = fields_by_name.get(name)
+                if field is None or not isinstance(mapping, dict):
+                    continue
+                
+                unified_field = mapping.get('unified_field')
+                confidence = max(0.0, min(1.0, float(mapping.get('confidence', 0.0))))
+                if not unified_field or str(unified_field).lower() == 'none':
+                    unified_field, confidence = None, 0.0
+                
+                mappings[field] = (unified_field, confidence)
+            
+            logger.info(f"LLM batch mapping: {len(mappings)}/{len(source_fields)} fields mapped in one call")
+            return mappings
+            
+        except Exception as e:
+            logger.error(f"Error parsing batched LLM response: {str(e)}")
+            return {}
+    
     def _parse_llm_response(self, response_text: str) -> Tuple[Optional[str], float]:
         """
         Parse LLM response to extract unified field name and confidence score.
@@ -162,11 +294,8 @@ class LLMSchemaMapper:
         """
         try:
             # Try to extract JSON from response
-            json_match = re.search(r'\{[^}]*\}', response_text)
-            if json_match:
-                json_str = json_match.group()
-                parsed = json.loads(json_str)
-                
+            parsed = self.extract_json(response_text)
+            if isinstance(parsed, dict):
                 unified_field = parsed.get('unified_field')
                 confidence = float(parsed.get('confidence', 0.0))
                 